@@ -0,0 +1,132 @@
+"""Benchmark of the smart group keyword matcher.
+
+Compares KeywordMatcher, which runs one substring test per keyword, with a
+single regex alternation of all keywords, over generated entity texts and
+increasing keyword counts. Both are checked against a brute-force match
+first. The alternation was the matcher's earlier implementation; it is kept
+here so the choice can be re-measured on a new Python release.
+
+Needs neither Home Assistant nor a running instance.
+
+Usage::
+
+    python benchmarks/bench_matcher.py
+    python benchmarks/bench_matcher.py --counts 5 50 500 --entities 20000
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import pathlib
+import random
+import re
+import string
+import timeit
+from collections.abc import Iterable
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+MATCHER = ROOT / "custom_components" / "combined_notifications" / "matcher.py"
+
+DEFAULT_COUNTS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000)
+DEFAULT_ENTITIES = 5_000
+WORDS = (
+    "kitchen", "door", "window", "battery", "motion", "leak", "living", "room",
+    "garage", "temp", "sensor", "binary", "light", "plug", "lock", "office",
+    "porch", "doorbell", "bell",
+)
+DOMAINS = ("binary_sensor", "sensor", "light", "switch", "lock")
+
+
+def _load_matcher():
+    """Import matcher.py alone; the package itself imports Home Assistant."""
+    spec = importlib.util.spec_from_file_location("cn_matcher", MATCHER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.KeywordMatcher
+
+
+class RegexMatcher:
+    """One regex alternation of all keywords, longest first."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        ordered = sorted({k.lower() for k in keywords if k}, key=lambda k: (-len(k), k))
+        self._pattern = re.compile("|".join(map(re.escape, ordered))) if ordered else None
+        # A match only reports the longest keyword at a position; each keyword
+        # stands for the shorter ones it contains.
+        self._implies = {
+            keyword: frozenset(k for k in ordered if k in keyword) for keyword in ordered
+        }
+
+    def find(self, text: str) -> frozenset[str]:
+        found: frozenset[str] = frozenset()
+        if self._pattern is None:
+            return found
+        search = self._pattern.search
+        match = search(text)
+        while match is not None:
+            keyword = match.group()
+            if keyword not in found:
+                found = found | self._implies[keyword]
+            match = search(text, match.start() + 1)
+        return found
+
+
+def generate_texts(count: int, rng: random.Random) -> list[str]:
+    """Entity texts as smart groups build them: entity id, NUL, friendly name."""
+    texts = []
+    for index in range(count):
+        first, second = rng.choice(WORDS), rng.choice(WORDS)
+        texts.append(
+            f"{rng.choice(DOMAINS)}.{first}_{second}_{index}\x00"
+            f"{first.title()} {second.title()} {index}".lower()
+        )
+    return texts
+
+
+def generate_keywords(count: int, rng: random.Random) -> list[str]:
+    """The common words first, then random ones that rarely match."""
+    keywords = list(WORDS[:count])
+    seen = set(keywords)
+    while len(keywords) < count:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        if word not in seen:
+            seen.add(word)
+            keywords.append(word)
+    return keywords
+
+
+def per_entity_us(matcher, texts: list[str], repeat: int) -> float:
+    find = matcher.find
+    best = min(timeit.repeat(lambda: [find(t) for t in texts], number=1, repeat=repeat))
+    return best / len(texts) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=list(DEFAULT_COUNTS))
+    parser.add_argument("--entities", type=int, default=DEFAULT_ENTITIES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    keyword_matcher = _load_matcher()
+    rng = random.Random(args.seed)
+    texts = generate_texts(args.entities, rng)
+
+    print(f"{'keywords':>8}  {'substring µs':>12}  {'regex µs':>9}  {'regex/substring':>15}")
+    for count in args.counts:
+        keywords = generate_keywords(count, rng)
+        substring, regex = keyword_matcher(keywords), RegexMatcher(keywords)
+        for text in texts:
+            expected = frozenset(k for k in keywords if k in text)
+            assert substring.find(text) == expected == regex.find(text), text
+        substring_us = per_entity_us(substring, texts, args.repeat)
+        regex_us = per_entity_us(regex, texts, args.repeat)
+        print(
+            f"{count:>8}  {substring_us:>12.2f}  {regex_us:>9.2f}  "
+            f"{regex_us / substring_us:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
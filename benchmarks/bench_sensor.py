@@ -0,0 +1,335 @@
+"""Benchmarks for the Combined Notifications sensor evaluation hot path.
+
+Runs CombinedNotificationSensor against a lightweight stand-in for
+``hass.states`` and the event bus, over generated installs of increasing
+size, and writes machine-readable results so releases can be compared.
+The sensor is driven only through what Home Assistant itself calls: entity
+setup, state_changed events on the bus, async_update and a conditions save.
+The stand-in is the one the tests use (tests/common.py).
+
+Requires Home Assistant to be importable (the integration imports it), but
+no running instance; without it the benchmark is skipped.
+
+Usage::
+
+    python benchmarks/bench_sensor.py
+    python benchmarks/bench_sensor.py --sizes 1000 10000 --output results.json
+    python benchmarks/bench_sensor.py --compare old.json new.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import pathlib
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+try:
+    from custom_components.combined_notifications import sensor as cn_sensor
+    from tests.common import FakeHass
+except ImportError as err:
+    IMPORT_ERROR: ImportError | None = err
+else:
+    IMPORT_ERROR = None
+
+MANIFEST = ROOT / "custom_components" / "combined_notifications" / "manifest.json"
+
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+SMART_GROUP_KEYWORDS = ("door", "battery", "window", "motion", "leak")
+# Saved in turn with SMART_GROUP_KEYWORDS to time smart group expansion
+OTHER_GROUP_KEYWORDS = ("light", "temperature", "plug", "lock", "power")
+NUMERIC_KEYWORDS = frozenset({"battery", "temperature", "power"})
+MEMBERSHIP_CHANGES = 200
+INDIVIDUAL_CONDITIONS = 200
+EVENTS_PER_RUN = 2_000
+
+ROOMS = (
+    "Kitchen", "Living Room", "Bedroom", "Bathroom", "Garage", "Office",
+    "Hallway", "Basement", "Attic", "Porch", "Laundry", "Guest Room",
+)
+THINGS = (
+    ("binary_sensor", "Door", ("on", "off")),
+    ("binary_sensor", "Window", ("on", "off")),
+    ("binary_sensor", "Motion", ("on", "off")),
+    ("binary_sensor", "Leak", ("on", "off")),
+    ("sensor", "Battery", None),
+    ("sensor", "Power", None),
+    ("sensor", "Temperature", None),
+    ("light", "Light", ("on", "off")),
+    ("switch", "Plug", ("on", "off")),
+    ("lock", "Lock", ("locked", "unlocked")),
+    ("media_player", "Speaker", ("playing", "idle")),
+    ("zone", "Zone", ("0",)),  # outside RELEVANT_DOMAINS
+)
+
+
+# ── Generated installs ───────────────────────────────────────────────────────
+
+def populate(hass: FakeHass, size: int, rng: random.Random) -> list[str]:
+    """Fill hass.states with size generated entities and return their ids."""
+    entity_ids = []
+    for n in range(size):
+        domain, thing, values = THINGS[n % len(THINGS)]
+        room = ROOMS[(n // len(THINGS)) % len(ROOMS)]
+        friendly_name = f"{room} {thing} {n}"
+        entity_id = f"{domain}.{friendly_name.lower().replace(' ', '_')}"
+        state = rng.choice(values) if values else str(rng.randint(0, 100))
+        attributes = {"friendly_name": friendly_name}
+        if thing == "Battery":
+            attributes["unit_of_measurement"] = "%"
+        hass.states.async_set(entity_id, state, attributes)
+        entity_ids.append(entity_id)
+    return entity_ids
+
+
+def build_groups(keywords: tuple[str, ...]) -> list[dict]:
+    """One smart group per keyword."""
+    return [
+        {
+            "entity_filter": keyword, "entity_filter_name": keyword.title(),
+            "operator": "<" if keyword in NUMERIC_KEYWORDS else "==",
+            "trigger_value": "20" if keyword in NUMERIC_KEYWORDS else "on",
+            "entity_filter_exclude": [], "entity_label_overrides": {},
+            "and_conditions": [], "paused": False,
+        }
+        for keyword in keywords
+    ]
+
+
+def build_conditions(entity_ids: list[str], rng: random.Random) -> list[dict]:
+    """Individual conditions on random entities plus one smart group per keyword."""
+    conditions = []
+    numeric = [e for e in entity_ids if e.startswith("sensor.")]
+    binary = [e for e in entity_ids if e.startswith("binary_sensor.")]
+    for n in range(INDIVIDUAL_CONDITIONS):
+        if n % 2:
+            conditions.append({
+                "entity_id": rng.choice(numeric), "operator": "<",
+                "trigger_value": "20", "name": f"Numeric {n}", "paused": False,
+            })
+        else:
+            conditions.append({
+                "entity_id": rng.choice(binary), "operator": "==",
+                "trigger_value": "on", "name": f"Binary {n}", "paused": False,
+                "and_conditions": [
+                    {"entity_id": rng.choice(binary), "operator": "==", "trigger_value": "on"},
+                ],
+            })
+    return conditions + build_groups(SMART_GROUP_KEYWORDS)
+
+
+def watched_entities(hass: FakeHass, conditions: list[dict]) -> list[str]:
+    """Entities a condition names or a smart group keyword can match."""
+    entity_ids = set()
+    keywords = []
+    for condition in conditions:
+        if condition.get("entity_filter"):
+            keywords.append(condition["entity_filter"])
+        else:
+            entity_ids.add(condition["entity_id"])
+        entity_ids.update(c["entity_id"] for c in condition.get("and_conditions", ()))
+    for state_obj in hass.states.async_all():
+        text = f"{state_obj.entity_id} {state_obj.attributes.get('friendly_name', '')}".lower()
+        if any(keyword in text for keyword in keywords):
+            entity_ids.add(state_obj.entity_id)
+    return sorted(entity_ids)
+
+
+def make_sensor(hass: FakeHass, conditions: list[dict], index: int = 0):
+    """Create a sensor whose state changes are processed on the next loop pass."""
+    kwargs = {}
+    parameters = inspect.signature(cn_sensor.CombinedNotificationSensor).parameters
+    for name in ("debounce_quiet_ms", "debounce_max_latency_ms"):
+        if name in parameters:  # releases before the scheduler update at once
+            kwargs[name] = 0
+    sensor = cn_sensor.CombinedNotificationSensor(
+        hass, f"bench_{index}", f"Bench {index}", conditions,
+        cn_sensor._build_settings({}), f"entry_{index}", **kwargs,
+    )
+    sensor.async_write_ha_state = lambda: None
+    return sensor
+
+
+# ── Measurements ─────────────────────────────────────────────────────────────
+
+async def async_timed(func: Callable[[], Any], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return latency percentiles in microseconds."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p95_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+async def run_size(size: int, seed: int) -> dict[str, Any]:
+    rng = random.Random(seed)
+    hass = FakeHass()
+    entity_ids = populate(hass, size, rng)
+    conditions = build_conditions(entity_ids, rng)
+    watched = watched_entities(hass, conditions)
+
+    # Memory per sensor: construction, entity setup and first evaluation.
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sensor = make_sensor(hass, conditions)
+    await sensor.async_added_to_hass()
+    await sensor.async_update()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Entity setup of further sensors alongside the first.
+    setup = []
+    for index in range(1, 6):
+        other = make_sensor(hass, conditions, index)
+        start = time.perf_counter()
+        await other.async_added_to_hass()
+        setup.append(time.perf_counter() - start)
+        await other.async_will_remove_from_hass()
+
+    full_update = await async_timed(sensor.async_update, 5)
+
+    # A conditions save from the panel, alternately adding and dropping one.
+    conditions_save = []
+    if hasattr(sensor, "async_update_conditions"):
+        extra = {**conditions[0], "name": "Extra"}
+        for n in range(6):
+            saved = [*conditions, extra] if n % 2 == 0 else conditions
+            start = time.perf_counter()
+            await sensor.async_update_conditions(saved)
+            conditions_save.append(time.perf_counter() - start)
+
+    # Smart group expansion: saves that differ only in their groups.
+    group_save = []
+    if hasattr(sensor, "async_update_conditions"):
+        individual = conditions[:INDIVIDUAL_CONDITIONS]
+        for n in range(6):
+            keywords = OTHER_GROUP_KEYWORDS if n % 2 == 0 else SMART_GROUP_KEYWORDS
+            saved = individual + build_groups(keywords)
+            start = time.perf_counter()
+            await sensor.async_update_conditions(saved)
+            group_save.append(time.perf_counter() - start)
+
+    # Smart group membership: an entity matching a group appears and goes.
+    membership = []
+    for n in range(MEMBERSHIP_CHANGES):
+        entity_id = f"binary_sensor.bench_door_{n // 2}"
+        start = time.perf_counter()
+        if n % 2 == 0:
+            hass.async_set_state(entity_id, "on", {"friendly_name": f"Bench Door {n // 2}"})
+        else:
+            hass.async_remove_state(entity_id)
+        await hass.async_block_till_done()
+        membership.append(time.perf_counter() - start)
+
+    # Per-event latency: fire state_changed for a watched entity and run the
+    # loop until the sensor's scheduled update has finished.
+    events = []
+    for _ in range(EVENTS_PER_RUN):
+        entity_id = rng.choice(watched)
+        state_obj = hass.states.get(entity_id)
+        if entity_id.startswith("sensor."):
+            value = str(rng.randint(0, 100))
+        else:
+            value = "off" if state_obj.state == "on" else "on"
+        start = time.perf_counter()
+        hass.async_set_state(entity_id, value, dict(state_obj.attributes))
+        await hass.async_block_till_done()
+        events.append(time.perf_counter() - start)
+
+    await sensor.async_will_remove_from_hass()
+
+    result = {
+        "entities": size,
+        "conditions": len(conditions),
+        "watched_entities": len(watched),
+        "memory_per_sensor_bytes": after - before,
+        "setup": summarize(setup),
+        "full_update": summarize(full_update),
+        "event_latency": summarize(events),
+    }
+    if conditions_save:
+        result["conditions_save"] = summarize(conditions_save)
+        result["smart_group_expansion"] = summarize(group_save)
+    result["smart_group_membership"] = summarize(membership)
+    return result
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print the relative change of every p50 between two result files."""
+    old = json.loads(pathlib.Path(old_path).read_text())
+    new = json.loads(pathlib.Path(new_path).read_text())
+    print(f"{old['version']} -> {new['version']}")
+    for size, new_result in new["results"].items():
+        old_result = old["results"].get(size)
+        if not old_result:
+            continue
+        for metric, value in new_result.items():
+            if isinstance(value, dict) and "p50_us" in value and metric in old_result:
+                before = old_result[metric]["p50_us"]
+                change = (value["p50_us"] - before) / before * 100 if before else 0.0
+                print(f"  {size:>6} {metric:<22} {before:>12.1f}us -> {value['p50_us']:>12.1f}us ({change:+.1f}%)")
+
+
+async def async_main(sizes: list[int], seed: int) -> dict[str, Any]:
+    results = {}
+    for size in sizes:
+        print(f"Running {size} entities...", file=sys.stderr)
+        results[str(size)] = await run_size(size, seed)
+    return {
+        "version": json.loads(MANIFEST.read_text())["version"],
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if IMPORT_ERROR is not None:
+        print(f"Skipping: Home Assistant is not importable ({IMPORT_ERROR})", file=sys.stderr)
+        return
+
+    report = asyncio.run(async_main(args.sizes, args.seed))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
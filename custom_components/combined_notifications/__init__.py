@@ -1,26 +1,32 @@
 """Combined Notifications integration."""
 # Integration version: 8.10.2
 import logging
-import os
-import time
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.components import frontend, websocket_api
-from homeassistant.components.http import StaticPathConfig
 import voluptuous as vol
-from .const import DOMAIN, COLOR_MAP, RELEVANT_DOMAINS
+from .assets import PANEL_HTML, PANEL_LIT, async_load_assets, get_asset
+from .condition_store import (
+    async_get_condition_store,
+    async_migrate_conditions,
+    async_remove_condition_store,
+    entry_config,
+)
+from .const import DOMAIN, COLOR_MAP, STATE_FIELDS
+from .hub import async_get_hub
+from .membership import preview_smart_groups
 from .panel_api import async_register_views
+from .panel_states import StateStream, build_states_payload, compact_rows
+from .profiling import async_register_services
+from .search import async_get_search_index, async_stop_search_index
+from .versioning import async_get_versions, async_stop_versions
 
 _LOGGER = logging.getLogger(__name__)
 
-PANEL_TIMESTAMP = int(time.time())
-PANEL_LIT_URL = "/combined_notifications_panel_lit"
-PANEL_LIT_FILENAME = "panel_lit.js"
-
 
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
-    """Migrate old v1 entries to v2 format."""
+    """Migrate old entries: v1 → v2 renames fields, v2 → v3 moves the conditions to their own store."""
     _LOGGER.debug("Migrating config entry from version %s", config_entry.version)
 
     if config_entry.version == 1:
@@ -45,26 +51,28 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
             config_entry, data=data, version=2,
         )
         _LOGGER.info("Migrated Combined Notifications entry %s from v1 → v2", config_entry.entry_id)
-        return True
 
-    return False
+    if config_entry.version == 2:
+        await async_migrate_conditions(hass, config_entry)
+        _LOGGER.info("Migrated Combined Notifications entry %s from v2 → v3", config_entry.entry_id)
+
+    return config_entry.version == 3
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Combined Notifications component."""
     hass.data.setdefault(DOMAIN, {})
 
-    # Register the LitElement panel JS as a static path
-    panel_path = os.path.join(os.path.dirname(__file__), PANEL_LIT_FILENAME)
-    _LOGGER.info("Registering CN LitElement panel from: %s", panel_path)
-
-    if not os.path.exists(panel_path):
-        _LOGGER.error("LitElement panel file not found at %s", panel_path)
+    # Load the panel files once: served from memory, precompressed, at
+    # content-hashed URLs (see assets.py)
+    try:
+        assets = await async_load_assets(hass)
+    except OSError as err:
+        _LOGGER.error("Panel files could not be loaded: %s", err)
         return False
+    _LOGGER.info("Registering CN LitElement panel at %s", assets[PANEL_LIT].url)
 
-    await hass.http.async_register_static_paths([
-        StaticPathConfig(PANEL_LIT_URL + ".js", panel_path, False)
-    ])
+    async_register_services(hass)
 
     return True
 
@@ -76,6 +84,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     compatibility_mode = entry.options.get("compatibility_mode", False)
     use_attributes = entry.options.get("use_attributes", False)
 
+    # A (re)loaded entry may carry a new config: invalidate panel ETags
+    async_get_versions(hass).async_bump_config(entry.entry_id)
+
+    # Conditions live in their own store; the sensor platform reads them
+    await async_get_condition_store(hass, entry)
+
     # If sensor already loaded, update use_attributes flag live
     sensor = hass.data[DOMAIN].get(entry.entry_id)
     if sensor and hasattr(sensor, "async_update_use_attributes"):
@@ -89,8 +103,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Register websocket commands once only — avoids duplicate registration warnings on reload
     if not hass.data[DOMAIN].get("_ws_registered"):
         websocket_api.async_register_command(hass, websocket_get_config)
+        websocket_api.async_register_command(hass, websocket_bootstrap)
         websocket_api.async_register_command(hass, websocket_get_states)
+        websocket_api.async_register_command(hass, websocket_subscribe_states)
+        websocket_api.async_register_command(hass, websocket_search_entities)
+        websocket_api.async_register_command(hass, websocket_preview_smart_groups)
         websocket_api.async_register_command(hass, websocket_save_config)
+        websocket_api.async_register_command(hass, websocket_add_condition)
+        websocket_api.async_register_command(hass, websocket_update_condition)
+        websocket_api.async_register_command(hass, websocket_remove_condition)
+        websocket_api.async_register_command(hass, websocket_set_paused)
+        websocket_api.async_register_command(hass, websocket_get_stats)
         hass.data[DOMAIN]["_ws_registered"] = True
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
@@ -111,7 +134,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             sidebar_title=None,
             sidebar_icon=None,
             frontend_url_path=panel_url,
-            config={"url": f"/api/combined_notifications/panel?entry_id={entry.entry_id}&v={PANEL_TIMESTAMP}"},
+            config={"url": f"/api/combined_notifications/panel?entry_id={entry.entry_id}&v={get_asset(hass, PANEL_HTML).digest}"},
             require_admin=True,
         )
     else:
@@ -125,7 +148,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             config={
                 "_panel_custom": {
                     "name": "combined-notifications-panel",
-                    "js_url": PANEL_LIT_URL + f".js?v={PANEL_TIMESTAMP}",
+                    "js_url": get_asset(hass, PANEL_LIT).url,
                     "embed_iframe": False,
                     "trust_external_script": False,
                     "config": {"entry_id": entry.entry_id},
@@ -142,9 +165,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     frontend.async_remove_panel(hass, f"combined-notifications-{entry.entry_id}", warn_if_unknown=False)
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, ["sensor"]):
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        # The search index and content versions are shared; stop them with
+        # the last loaded entry
+        if not any(not key.startswith("_") for key in hass.data[DOMAIN]):
+            async_stop_search_index(hass)
+            async_stop_versions(hass)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored conditions of a removed entry."""
+    await async_remove_condition_store(hass, entry.entry_id)
+    if not any(not key.startswith("_") for key in hass.data.get(DOMAIN, {})):
+        async_stop_search_index(hass)
+        async_stop_versions(hass)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the config entry."""
     await async_unload_entry(hass, entry)
@@ -169,36 +205,152 @@ async def websocket_get_config(hass, connection, msg):
         return
 
     connection.send_result(msg["id"], {
-        "config": dict(entry.data),
+        "config": entry_config(hass, entry),
         "options": dict(entry.options),
         "states": {}
     })
 
 
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/bootstrap",
+    vol.Required("entry_id"): str,
+    vol.Optional("attributes"): [str],
+})
+@callback
+def websocket_bootstrap(hass, connection, msg):
+    """
+    Open the panel in one round trip. The first event carries the config,
+    every relevant entity as compact rows sorted by entity_id (see
+    compact_rows) and the preview of each smart group, aligned with the
+    conditions. State deltas follow as in subscribe_states.
+    """
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Config entry not found")
+        return
+
+    @callback
+    def _send(delta):
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    config = entry_config(hass, entry)
+    conditions = config.get("conditions", [])
+    previews = iter(preview_smart_groups(
+        hass, [c for c in conditions if "entity_filter" in c]
+    ))
+    stream = StateStream(hass, _send, STATE_FIELDS, msg.get("attributes"))
+    connection.subscriptions[msg["id"]] = stream.async_stop
+    connection.send_result(msg["id"])
+    _send({
+        "config": config,
+        "options": dict(entry.options),
+        "rows": compact_rows(stream.async_start()),
+        "groups": [next(previews) if "entity_filter" in c else None for c in conditions],
+    })
+
+
 @websocket_api.websocket_command({
     vol.Required("type"): "combined_notifications/get_states",
     vol.Required("entry_id"): str,
+    vol.Optional("fields"): [vol.In(STATE_FIELDS)],
+    vol.Optional("attributes"): [str],
+    vol.Optional("domains"): [str],
+    vol.Optional("prefix"): str,
+    vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+    vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
 })
 @websocket_api.async_response
 async def websocket_get_states(hass, connection, msg):
-    """Return entity states - called by the panel after it loads."""
+    """
+    Return entity states - called by the panel after it loads.
+    Optional fields/attributes project each entity, domains/prefix filter
+    them and offset/limit page through them.
+    """
     entry_id = msg["entry_id"]
     entry = hass.config_entries.async_get_entry(entry_id)
     if not entry:
         connection.send_error(msg["id"], "not_found", "Config entry not found")
         return
 
-    states = {
-        state.entity_id: {
-            "state": state.state,
-            "attributes": dict(state.attributes),
-            "friendly_name": state.attributes.get("friendly_name", state.entity_id),
-        }
-        for state in hass.states.async_all()
-        if state.domain in RELEVANT_DOMAINS
-    }
+    connection.send_result(msg["id"], build_states_payload(
+        hass,
+        fields=msg.get("fields"),
+        attributes=msg.get("attributes"),
+        domains=msg.get("domains"),
+        prefix=msg.get("prefix"),
+        offset=msg["offset"],
+        limit=msg.get("limit"),
+    ))
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/subscribe_states",
+    vol.Required("entry_id"): str,
+    vol.Optional("fields"): [vol.In(STATE_FIELDS)],
+    vol.Optional("attributes"): [str],
+})
+@callback
+def websocket_subscribe_states(hass, connection, msg):
+    """
+    Stream entity states to the panel: one {"snapshot": rows} event, then
+    batched {"changed", "added", "removed"} deltas until unsubscribed.
+    fields/attributes project each row as in get_states.
+    """
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Config entry not found")
+        return
+
+    @callback
+    def _send(delta):
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    stream = StateStream(hass, _send, msg.get("fields"), msg.get("attributes"))
+    connection.subscriptions[msg["id"]] = stream.async_stop
+    connection.send_result(msg["id"])
+    _send({"snapshot": stream.async_start()})
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/search_entities",
+    vol.Required("entry_id"): str,
+    vol.Required("query"): str,
+    vol.Optional("limit", default=50): vol.All(int, vol.Range(min=1, max=500)),
+    vol.Optional("domains"): [str],
+})
+@callback
+def websocket_search_entities(hass, connection, msg):
+    """Return the best ranked entities for the condition editor's picker."""
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Config entry not found")
+        return
+
+    results = async_get_search_index(hass).search(
+        msg["query"], msg["limit"], msg.get("domains")
+    )
+    connection.send_result(msg["id"], {"query": msg["query"], "results": results})
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/preview_smart_groups",
+    vol.Required("entry_id"): str,
+    vol.Required("groups"): [{
+        vol.Required("entity_filter"): str,
+        vol.Optional("entity_filter_exclude", default=[]): [str],
+    }],
+})
+@callback
+def websocket_preview_smart_groups(hass, connection, msg):
+    """Return members and counts of the smart groups being edited."""
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Config entry not found")
+        return
 
-    connection.send_result(msg["id"], {"states": states})
+    connection.send_result(
+        msg["id"], {"groups": preview_smart_groups(hass, msg["groups"])}
+    )
 
 
 @websocket_api.websocket_command({
@@ -216,8 +368,14 @@ async def websocket_save_config(hass, connection, msg):
         return
 
     try:
+        # Conditions go to the condition store; the entry is only rewritten
+        # when the other settings change.
         new_data = {**entry.data, **msg["data"]}
+        store = await async_get_condition_store(hass, entry)
+        if "conditions" in new_data:
+            store.async_set_conditions(new_data.pop("conditions"))
         hass.config_entries.async_update_entry(entry, data=new_data)
+        async_get_versions(hass).async_bump_config(entry_id)
 
         sensor = hass.data.get(DOMAIN, {}).get(entry_id)
         if sensor and hasattr(sensor, "async_update_settings"):
@@ -244,9 +402,129 @@ async def websocket_save_config(hass, connection, msg):
                 "hide_title": d.get("hide_title", False),
                 "hide_title_alert": d.get("hide_title_alert", False),
             }
-            await sensor.async_update_settings(settings, d.get("conditions", []))
+            await sensor.async_update_settings(settings, store.conditions)
 
-        connection.send_result(msg["id"], {"success": True})
+        connection.send_result(msg["id"], {"success": True, "conditions": store.conditions})
     except Exception as err:
         _LOGGER.exception("Failed to save config")
         connection.send_error(msg["id"], "save_failed", str(err))
+
+
+async def _async_patch_conditions(hass, connection, msg, patch):
+    """
+    Apply one condition change to the entry's condition store and the
+    sensor, and answer with patch(store)'s result.
+    """
+    entry_id = msg["entry_id"]
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Config entry not found")
+        return
+
+    store = await async_get_condition_store(hass, entry)
+    try:
+        result = patch(store)
+    except KeyError:
+        connection.send_error(msg["id"], "not_found", "Condition not found")
+        return
+    async_get_versions(hass).async_bump_config(entry_id)
+
+    sensor = hass.data[DOMAIN].get(entry_id)
+    if sensor and hasattr(sensor, "async_apply_conditions"):
+        try:
+            await sensor.async_apply_conditions(store.conditions)
+        except Exception as err:
+            _LOGGER.exception("Failed to apply conditions")
+            connection.send_error(msg["id"], "save_failed", str(err))
+            return
+
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/add_condition",
+    vol.Required("entry_id"): str,
+    vol.Required("condition"): dict,
+})
+@websocket_api.async_response
+async def websocket_add_condition(hass, connection, msg):
+    """Append one condition; the result carries its new id."""
+    await _async_patch_conditions(
+        hass, connection, msg,
+        lambda store: {"condition": store.async_add(msg["condition"])},
+    )
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/update_condition",
+    vol.Required("entry_id"): str,
+    vol.Required("condition_id"): str,
+    vol.Required("condition"): dict,
+})
+@websocket_api.async_response
+async def websocket_update_condition(hass, connection, msg):
+    """Replace one condition by id."""
+    await _async_patch_conditions(
+        hass, connection, msg,
+        lambda store: {
+            "condition": store.async_update(msg["condition_id"], msg["condition"])
+        },
+    )
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/remove_condition",
+    vol.Required("entry_id"): str,
+    vol.Required("condition_id"): str,
+})
+@websocket_api.async_response
+async def websocket_remove_condition(hass, connection, msg):
+    """Remove one condition by id."""
+    await _async_patch_conditions(
+        hass, connection, msg,
+        lambda store: store.async_remove_condition(msg["condition_id"]),
+    )
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/set_paused",
+    vol.Required("entry_id"): str,
+    vol.Required("condition_id"): str,
+    vol.Required("paused"): bool,
+})
+@websocket_api.async_response
+async def websocket_set_paused(hass, connection, msg):
+    """Pause or resume one condition by id."""
+    await _async_patch_conditions(
+        hass, connection, msg,
+        lambda store: {
+            "condition": store.async_set_paused(msg["condition_id"], msg["paused"])
+        },
+    )
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "combined_notifications/get_stats",
+    vol.Optional("entry_id"): str,
+})
+@callback
+def websocket_get_stats(hass, connection, msg):
+    """Return the runtime counters of one sensor, or of every sensor."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if "entry_id" in msg:
+        sensor = domain_data.get(msg["entry_id"])
+        if not hasattr(sensor, "stats"):
+            connection.send_error(msg["id"], "not_found", "Sensor not found")
+            return
+        sensors = {msg["entry_id"]: sensor}
+    else:
+        sensors = {
+            entry_id: sensor
+            for entry_id, sensor in domain_data.items()
+            if hasattr(sensor, "stats")
+        }
+
+    connection.send_result(msg["id"], {
+        "hub": {"entities": async_get_hub(hass).entity_count},
+        "sensors": {entry_id: sensor.stats() for entry_id, sensor in sensors.items()},
+    })
@@ -0,0 +1,147 @@
+"""In-memory, precompressed panel assets for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import pathlib
+
+from aiohttp import web
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+try:  # Brotli is optional; gzip is always available
+    import brotli
+except ImportError:  # pragma: no cover - depends on the install
+    brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+ASSETS_KEY = "_assets"
+
+# Hashed URLs never change content, so browsers may keep them for good
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+ASSET_URL = "/combined_notifications_static"
+
+PANEL_LIT = "panel_lit.js"
+PANEL_IFRAME = "panel_iframe.js"
+PANEL_HTML = "panel.html"
+
+# Where panel.html loads the iframe panel script from before rewriting
+_PANEL_HTML_SCRIPT = '<script src="/api/combined_notifications/panel.js?v=600"></script>'
+
+_CONTENT_TYPES = {
+    ".js": "application/javascript",
+    ".html": "text/html",
+}
+
+
+def _encoding_qualities(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into coding -> q value."""
+    qualities: dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities
+
+
+def _quality(qualities: dict[str, float], coding: str) -> float:
+    """Return the q value of coding; "*" covers codings not listed."""
+    return qualities.get(coding, qualities.get("*", 0.0))
+
+
+class PanelAsset:
+    """One panel file held in memory, with its compressed variants."""
+
+    __slots__ = ("filename", "content_type", "body", "gzip", "brotli", "digest")
+
+    def __init__(self, filename: str, body: bytes) -> None:
+        """Hash and compress body. Runs in the executor."""
+        self.filename = filename
+        self.content_type = _CONTENT_TYPES[pathlib.PurePath(filename).suffix]
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        self.gzip = gzip.compress(body, compresslevel=9, mtime=0)
+        self.brotli = brotli.compress(body) if brotli is not None else None
+
+    @property
+    def hashed_name(self) -> str:
+        """Return the file name keyed by its content hash."""
+        stem, _, suffix = self.filename.rpartition(".")
+        return f"{stem}.{self.digest}.{suffix}"
+
+    @property
+    def url(self) -> str:
+        """Return the content-hashed URL of this asset."""
+        return f"{ASSET_URL}/{self.hashed_name}"
+
+    def response(self, request: web.Request, cache_control: str) -> web.Response:
+        """Return the best encoding the client accepts; q=0 refuses one."""
+        qualities = _encoding_qualities(request.headers.get("Accept-Encoding", ""))
+        headers = {
+            "Cache-Control": cache_control,
+            "ETag": f'"{self.digest}"',
+            "Vary": "Accept-Encoding",
+        }
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            return web.Response(status=304, headers=headers)
+        body = self.body
+        br_quality = _quality(qualities, "br") if self.brotli is not None else 0.0
+        gzip_quality = _quality(qualities, "gzip")
+        if br_quality > 0 and br_quality >= gzip_quality:
+            body = self.brotli
+            headers["Content-Encoding"] = "br"
+        elif gzip_quality > 0:
+            body = self.gzip
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type=self.content_type, headers=headers)
+
+
+def _load_assets() -> dict[str, PanelAsset]:
+    """Read and compress every panel file. Runs in the executor."""
+    base = pathlib.Path(__file__).parent
+    assets = {
+        name: PanelAsset(name, (base / name).read_bytes())
+        for name in (PANEL_LIT, PANEL_IFRAME)
+    }
+    # panel.html points at the hashed iframe script, so its own hash changes
+    # whenever the script does.
+    html = (base / PANEL_HTML).read_text("utf-8")
+    script = f'<script src="{assets[PANEL_IFRAME].url}"></script>'
+    if _PANEL_HTML_SCRIPT in html:
+        html = html.replace(_PANEL_HTML_SCRIPT, script)
+    else:
+        _LOGGER.warning("panel.html script tag not found; serving it unchanged")
+    assets[PANEL_HTML] = PanelAsset(PANEL_HTML, html.encode("utf-8"))
+    return assets
+
+
+async def async_load_assets(hass: HomeAssistant) -> dict[str, PanelAsset]:
+    """Load the panel assets once and keep them in hass.data."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if ASSETS_KEY not in domain_data:
+        domain_data[ASSETS_KEY] = await hass.async_add_executor_job(_load_assets)
+        _LOGGER.debug(
+            "Loaded panel assets: %s (brotli %s)",
+            ", ".join(a.hashed_name for a in domain_data[ASSETS_KEY].values()),
+            "available" if brotli is not None else "unavailable",
+        )
+    return domain_data[ASSETS_KEY]
+
+
+def get_asset(hass: HomeAssistant, filename: str) -> PanelAsset:
+    """Return a loaded asset by its plain file name."""
+    return hass.data[DOMAIN][ASSETS_KEY][filename]
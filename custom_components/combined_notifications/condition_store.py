@@ -0,0 +1,197 @@
+"""Per-entry condition storage for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+import secrets
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORES_KEY = "_condition_stores"
+STORAGE_VERSION = 1
+
+# Seconds a change may wait before it is written; edits in a burst are
+# written once.
+SAVE_DELAY = 10
+
+
+def _new_id() -> str:
+    return secrets.token_hex(6)
+
+
+async def async_get_condition_store(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> ConditionStore:
+    """Return the loaded condition store of entry."""
+    stores = hass.data.setdefault(DOMAIN, {}).setdefault(STORES_KEY, {})
+    store = stores.get(entry.entry_id)
+    if store is None:
+        store = ConditionStore(hass, entry.entry_id)
+        await store.async_load()
+        stores[entry.entry_id] = store
+    return store
+
+
+async def async_migrate_conditions(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Move the conditions of a version 2 entry into its condition store and
+    make it a version 3 entry. The conditions in entry.data win over a store
+    left by an earlier run, so a restored backup of core.config_entries
+    brings its conditions back.
+    """
+    store = ConditionStore(hass, entry.entry_id)
+    await store.async_import(entry.data.get("conditions", []))
+    hass.data.setdefault(DOMAIN, {}).setdefault(STORES_KEY, {})[entry.entry_id] = store
+    data = {k: v for k, v in entry.data.items() if k != "conditions"}
+    hass.config_entries.async_update_entry(entry, data=data, version=3)
+
+
+@callback
+def get_condition_store(hass: HomeAssistant, entry_id: str) -> ConditionStore:
+    """Return the condition store of an entry that has been set up."""
+    return hass.data[DOMAIN][STORES_KEY][entry_id]
+
+
+async def async_remove_condition_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored conditions of a removed entry."""
+    store = hass.data.get(DOMAIN, {}).get(STORES_KEY, {}).pop(entry_id, None)
+    if store is None:
+        store = ConditionStore(hass, entry_id)
+    await store.async_remove()
+
+
+@callback
+def entry_config(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the panel's view of an entry: its data plus its conditions."""
+    store = hass.data.get(DOMAIN, {}).get(STORES_KEY, {}).get(entry.entry_id)
+    if store is None:  # entry not set up yet
+        return dict(entry.data)
+    return {**entry.data, "conditions": store.conditions}
+
+
+class ConditionStore:
+    """
+    The conditions of one entry, kept in their own storage file.
+
+    Conditions used to live in entry.data, so every save rewrote the shared
+    core.config_entries file. Here each condition carries an id and can be
+    added, changed or removed on its own, and writes are delayed so a burst
+    of edits is written once. Every change replaces the condition list and
+    the changed condition rather than mutating them, so a caller holding
+    the previous list can compare it with the new one.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.conditions.{entry_id}"
+        )
+        self._conditions: list[dict[str, Any]] = []
+
+    @property
+    def conditions(self) -> list[dict[str, Any]]:
+        """Return the conditions in order. Do not mutate."""
+        return self._conditions
+
+    async def async_load(self) -> None:
+        """Load the conditions; a new entry has none."""
+        data = await self._store.async_load()
+        self._conditions = data.get("conditions", []) if data else []
+
+    async def async_import(self, conditions: list[dict[str, Any]]) -> None:
+        """Replace every condition and write them at once."""
+        self._conditions = self._with_ids(conditions)
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the storage file, dropping any pending write."""
+        await self._store.async_remove()
+
+    # ── Changes ──────────────────────────────────────────────────────────
+
+    @callback
+    def async_set_conditions(self, conditions: list[dict[str, Any]]) -> bool:
+        """
+        Replace every condition, as a full save does. Conditions without
+        an id get one. Returns True when anything changed.
+        """
+        conditions = self._with_ids(conditions)
+        if conditions == self._conditions:
+            return False
+        self._conditions = conditions
+        self._schedule_save()
+        return True
+
+    @callback
+    def async_add(self, condition: dict[str, Any]) -> dict[str, Any]:
+        """Append a condition and return it with its new id."""
+        condition = {**condition, "id": _new_id()}
+        self._conditions = [*self._conditions, condition]
+        self._schedule_save()
+        return condition
+
+    @callback
+    def async_update(
+        self, condition_id: str, condition: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Replace one condition, keeping its id and position, and return it.
+        Raises KeyError for an unknown id.
+        """
+        position = self._position(condition_id)
+        condition = {**condition, "id": condition_id}
+        conditions = list(self._conditions)
+        conditions[position] = condition
+        self._conditions = conditions
+        self._schedule_save()
+        return condition
+
+    @callback
+    def async_set_paused(self, condition_id: str, paused: bool) -> dict[str, Any]:
+        """Pause or resume one condition and return it."""
+        position = self._position(condition_id)
+        return self.async_update(
+            condition_id, {**self._conditions[position], "paused": paused}
+        )
+
+    @callback
+    def async_remove_condition(self, condition_id: str) -> None:
+        """Remove one condition. Raises KeyError for an unknown id."""
+        position = self._position(condition_id)
+        self._conditions = [
+            *self._conditions[:position], *self._conditions[position + 1:]
+        ]
+        self._schedule_save()
+
+    def _position(self, condition_id: str) -> int:
+        for position, condition in enumerate(self._conditions):
+            if condition.get("id") == condition_id:
+                return position
+        raise KeyError(condition_id)
+
+    @staticmethod
+    def _with_ids(conditions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return the conditions, giving every one a unique id."""
+        seen: set[str] = set()
+        result = []
+        for condition in conditions:
+            condition_id = condition.get("id")
+            if not condition_id or condition_id in seen:
+                condition = {**condition, "id": _new_id()}
+            seen.add(condition["id"])
+            result.append(condition)
+        return result
+
+    # ── Persistence ──────────────────────────────────────────────────────
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"conditions": self._conditions}
@@ -0,0 +1,173 @@
+"""Precompiled conditions for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import State
+
+from .const import OPERATOR_MAP
+
+_LOGGER = logging.getLogger(__name__)
+
+# Checked in this order so ">=" wins over ">" and "==" over "="
+_PREFIX_OPERATORS = (">=", "<=", "!=", ">", "<", "==", "=")
+_NUMERIC_OPERATORS = (">", "<", ">=", "<=")
+
+
+class Predicate:
+    """
+    The comparison half of a condition, resolved once.
+
+    The operator is normalised (panel labels, "=" and operators typed as a
+    trigger value prefix such as ">20"), and numeric thresholds are parsed
+    up front, so test() only reads the state and compares.
+    """
+
+    __slots__ = ("operator", "expected", "threshold", "attribute")
+
+    def __init__(self, operator: str, trigger_value: str, attribute: str = "") -> None:
+        """Resolve operator and trigger value."""
+        expected = trigger_value
+        if isinstance(expected, str):
+            for sym in _PREFIX_OPERATORS:
+                if expected.startswith(sym):
+                    operator = sym
+                    expected = expected[len(sym):].strip()
+                    break
+        operator = OPERATOR_MAP.get(operator, operator)
+        if operator == "=":
+            operator = "=="
+
+        self.operator: str | None = None
+        self.expected = str(expected)
+        self.threshold: float | None = None
+        self.attribute = attribute or ""
+
+        if operator in ("==", "!="):
+            self.operator = operator
+        elif operator in _NUMERIC_OPERATORS:
+            self.operator = operator
+            try:
+                self.threshold = float(expected)
+            except (ValueError, TypeError):
+                _LOGGER.debug(
+                    "Non-numeric threshold for %s: %s — condition never matches",
+                    operator, expected,
+                )
+        else:
+            _LOGGER.debug("Unknown operator %s — condition never matches", operator)
+
+    def key(self) -> tuple:
+        """Return a value that is equal for equivalent predicates."""
+        return (self.operator, self.expected, self.threshold, self.attribute)
+
+    def test(self, state_obj: State) -> bool:
+        """Return True if the state satisfies the comparison."""
+        if self.attribute:
+            actual = str(state_obj.attributes.get(self.attribute, ""))
+        else:
+            actual = state_obj.state
+
+        operator = self.operator
+        if operator == "==":
+            return actual == self.expected
+        if operator == "!=":
+            return actual != self.expected
+        if self.threshold is None:
+            return False
+        try:
+            value = float(actual)
+        except ValueError:
+            _LOGGER.debug(
+                "Condition evaluation failed (%s %s %s): not a number",
+                actual, operator, self.expected,
+            )
+            return False
+        if operator == ">":  return value > self.threshold
+        if operator == "<":  return value < self.threshold
+        if operator == ">=": return value >= self.threshold
+        return value <= self.threshold
+
+
+class CompiledCondition:
+    """A validated condition ready for the evaluation hot path."""
+
+    __slots__ = (
+        "entity_id", "predicate", "and_conditions",
+        "name", "label_template", "label_fallback",
+    )
+
+    def __init__(
+        self,
+        entity_id: str,
+        predicate: Predicate,
+        and_conditions: tuple[CompiledCondition, ...] = (),
+        name: str = "",
+        label_template: str | None = None,
+        label_fallback: str = "",
+    ) -> None:
+        """Initialize the compiled condition."""
+        self.entity_id = entity_id
+        self.predicate = predicate
+        self.and_conditions = and_conditions
+        self.name = name
+        self.label_template = label_template
+        self.label_fallback = label_fallback
+
+    def key(self) -> tuple:
+        """
+        Return a value that is equal for equivalent conditions, even when
+        they were compiled separately (e.g. before and after a save).
+        """
+        return (
+            self.entity_id,
+            self.predicate.key(),
+            tuple(and_cond.key() for and_cond in self.and_conditions),
+            self.name,
+            self.label_template,
+            self.label_fallback,
+        )
+
+    def for_member(self, entity_id: str, name: str) -> CompiledCondition:
+        """Return a smart group member sharing this group's predicate and AND chain."""
+        return CompiledCondition(entity_id, self.predicate, self.and_conditions, name)
+
+
+def compile_condition(condition: dict) -> CompiledCondition:
+    """
+    Compile a validated condition dict. Smart groups compile to a template
+    with no entity_id; members are produced with for_member().
+    """
+    and_conditions = tuple(
+        CompiledCondition(
+            and_cond["entity_id"],
+            Predicate(
+                and_cond.get("operator", "=="),
+                and_cond.get("trigger_value", ""),
+                and_cond.get("attribute", ""),
+            ),
+        )
+        for and_cond in condition.get("and_conditions", [])
+        if and_cond.get("entity_id")
+    )
+    predicate = Predicate(
+        condition.get("operator", "=="),
+        condition.get("trigger_value", ""),
+        condition.get("attribute", ""),
+    )
+    if "entity_filter" in condition:
+        return CompiledCondition("", predicate, and_conditions)
+
+    entity_id = condition.get("entity_id", "")
+    name = condition.get("name", "").strip()
+    label_template = None
+    label_fallback = ""
+    if condition.get("use_label_template", False) and condition.get("label_template", "").strip():
+        label_template = condition["label_template"]
+        label_fallback = (
+            condition.get("label_fallback", "").strip() or name or entity_id
+        )
+    return CompiledCondition(
+        entity_id, predicate, and_conditions, name, label_template, label_fallback
+    )
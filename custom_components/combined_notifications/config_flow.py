@@ -3,14 +3,18 @@ import logging
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import DOMAIN
+from .const import (
+    DEFAULT_DEBOUNCE_MAX_LATENCY_MS,
+    DEFAULT_DEBOUNCE_QUIET_MS,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class CombinedNotificationsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Combined Notifications."""
-    VERSION = 2
+    VERSION = 3
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step — just get the sensor name."""
@@ -46,7 +50,6 @@ class CombinedNotificationsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         "icon_color_alert": "White",
                         "hide_title": False,
                         "hide_title_alert": False,
-                        "conditions": [],
                     },
                 )
 
@@ -82,7 +85,16 @@ class CombinedNotificationsOptionsFlow(config_entries.OptionsFlow):
             # Save preference directly to options
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
-                options={"compatibility_mode": compatibility_mode, "use_attributes": use_attributes},
+                options={
+                    "compatibility_mode": compatibility_mode,
+                    "use_attributes": use_attributes,
+                    "debounce_quiet_ms": user_input.get(
+                        "debounce_quiet_ms", DEFAULT_DEBOUNCE_QUIET_MS
+                    ),
+                    "debounce_max_latency_ms": user_input.get(
+                        "debounce_max_latency_ms", DEFAULT_DEBOUNCE_MAX_LATENCY_MS
+                    ),
+                },
             )
             # Reload the entry so changes take effect immediately without HA restart
             self.hass.async_create_task(
@@ -94,10 +106,22 @@ class CombinedNotificationsOptionsFlow(config_entries.OptionsFlow):
 
         current_mode = self.config_entry.options.get("compatibility_mode", False)
         current_use_attributes = self.config_entry.options.get("use_attributes", False)
+        current_quiet = self.config_entry.options.get(
+            "debounce_quiet_ms", DEFAULT_DEBOUNCE_QUIET_MS
+        )
+        current_max_latency = self.config_entry.options.get(
+            "debounce_max_latency_ms", DEFAULT_DEBOUNCE_MAX_LATENCY_MS
+        )
 
         schema = vol.Schema({
             vol.Required("compatibility_mode", default=current_mode): bool,
             vol.Required("use_attributes", default=current_use_attributes): bool,
+            vol.Required("debounce_quiet_ms", default=current_quiet): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=10000)
+            ),
+            vol.Required("debounce_max_latency_ms", default=current_max_latency): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=60000)
+            ),
         })
 
         return self.async_show_form(
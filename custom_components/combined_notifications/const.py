@@ -18,6 +18,39 @@ RELEVANT_DOMAINS = {
     "alarm_control_panel", "fan", "vacuum", "water_heater", "humidifier",
 }
 
+# Domain groups of the smart group chips, in display order. Mirrors
+# DOMAIN_GROUPS in panel_lit.js; "Other" also catches every domain that no
+# named group lists.
+DOMAIN_GROUPS = {
+    "Sensors":  ["sensor", "binary_sensor", "input_boolean", "input_select", "input_number", "input_text", "input_datetime", "counter", "timer"],
+    "Lights":   ["light"],
+    "Switches": ["switch"],
+    "Locks":    ["lock"],
+    "Covers":   ["cover"],
+    "Climate":  ["climate"],
+    "Presence": ["person", "device_tracker"],
+    "Media":    ["media_player"],
+    "Cameras":  ["camera"],
+    "Alarms":   ["alarm_control_panel"],
+    "Other":    ["automation", "script", "scene", "button", "update", "number", "select", "fan", "vacuum", "water_heater", "humidifier"],
+}
+
+# Fields of an entity row sent to the panel (get_states). Requests may project
+# a subset of them and of the attributes; without a projection everything is
+# sent.
+STATE_FIELDS = ("state", "friendly_name", "attributes")
+
+# subscribe_states batches entity deltas like sensor updates are coalesced:
+# flushed once changes pause for the quiet window, at most max latency later.
+STATE_STREAM_QUIET = 0.25
+STATE_STREAM_MAX_LATENCY = 1.0
+
+# State change coalescing (options flow). A burst of state changes is folded
+# into one evaluation once the quiet window passes, but never later than the
+# max latency after the first change of the burst.
+DEFAULT_DEBOUNCE_QUIET_MS = 50
+DEFAULT_DEBOUNCE_MAX_LATENCY_MS = 500
+
 # Color options
 COLORS = [
     "Use YOUR Current Theme Color", "Red", "Green", "Bright Green", "Blue",
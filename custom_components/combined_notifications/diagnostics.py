@@ -0,0 +1,29 @@
+"""Diagnostics support for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .condition_store import entry_config
+from .const import DOMAIN
+from .hub import async_get_hub
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the config and runtime counters of a config entry."""
+    sensor = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return {
+        "entry": {
+            "title": entry.title,
+            "version": entry.version,
+            "data": entry_config(hass, entry),
+            "options": dict(entry.options),
+        },
+        "hub": {"entities": async_get_hub(hass).entity_count},
+        "stats": sensor.stats() if hasattr(sensor, "stats") else None,
+    }
@@ -0,0 +1,386 @@
+"""Incremental condition evaluation for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from itertools import chain
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, State
+
+from .conditions import CompiledCondition
+
+if TYPE_CHECKING:
+    from .profiling import Sampler
+
+_LOGGER = logging.getLogger(__name__)
+
+UNAVAILABLE_STATES = ("unknown", "unavailable")
+
+
+class EvaluationEngine:
+    """
+    Keep the unmet list of one sensor up to date one entity at a time.
+
+    The engine is loaded with one segment of compiled conditions per
+    validated condition: a single condition for an individual one, every
+    member for a smart group. A reverse index maps each entity_id — the
+    condition's own entity and every AND entity — to the conditions that
+    read it, so a state change only re-checks the conditions that can
+    actually change. Dynamic labels are indexed by template the same way,
+    and a segment can be replaced on its own when a group's members change.
+
+    Smart group members share their group's AND chain, so the result of
+    each AND sub-condition is remembered together with the state it was
+    tested against and reused until that state changes, and a whole group
+    is skipped, on a full pass or a re-check, when its shared AND chain
+    fails.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        label_for: Callable[[str, str], str],
+    ) -> None:
+        """Initialize the engine. label_for(template, fallback) returns a label."""
+        self._hass = hass
+        self._label_for = label_for
+        self._segments: list[list[CompiledCondition]] = []
+        self._index: dict[str, set[CompiledCondition]] = {}
+        self._template_index: dict[str, set[CompiledCondition]] = {}
+        # (segment, offset) of every loaded condition
+        self._positions: dict[CompiledCondition, tuple[int, int]] = {}
+        # Alert label per condition, parallel to the segments; None when met
+        self._results: list[list[str | None]] = []
+        # AND chain shared by every condition of a segment, parallel to the
+        # segments; () when there is none
+        self._gates: list[tuple[CompiledCondition, ...]] = []
+        # AND sub-condition -> (state it was tested against, passed)
+        self._and_memo: dict[CompiledCondition, tuple[State | None, bool]] = {}
+        # Conditions checked since creation
+        self.checks = 0
+        # The check every evaluation runs: _check, or a marking wrapper of
+        # it while start_sampling() is in effect
+        self._run_check: Callable[[CompiledCondition], str | None] = self._check
+
+    # ── Loading ──────────────────────────────────────────────────────────
+
+    def load(self, segments: list[list[CompiledCondition]]) -> None:
+        """Replace every segment and rebuild the reverse index."""
+        self._segments = segments
+        self._index = {}
+        self._template_index = {}
+        self._positions = {}
+        self._results = [[None] * len(conditions) for conditions in segments]
+        self._gates = [self._shared_gate(conditions) for conditions in segments]
+        self._and_memo = {}
+        for segment, conditions in enumerate(segments):
+            for offset, condition in enumerate(conditions):
+                self._positions[condition] = (segment, offset)
+                self._add_to_index(condition)
+
+    def reload(self, segments: list[list[CompiledCondition]]) -> bool:
+        """
+        Replace every segment like load(), but keep the result of every
+        condition equivalent to a loaded one and evaluate only the others.
+        Returns True when the unmet list changed.
+        """
+        previous: dict[tuple, list[tuple[CompiledCondition, str | None]]] = {}
+        for conditions, results in zip(self._segments, self._results):
+            for condition, result in zip(conditions, results):
+                previous.setdefault(condition.key(), []).append((condition, result))
+
+        old_unmet = self.unmet
+        kept_segments: list[list[CompiledCondition]] = []
+        kept_results: list[list[str | None]] = []
+        added: list[CompiledCondition] = []
+        for conditions in segments:
+            kept: list[CompiledCondition] = []
+            results: list[str | None] = []
+            for condition in conditions:
+                matches = previous.get(condition.key())
+                if matches:
+                    existing, result = matches.pop()
+                    kept.append(existing)
+                    results.append(result)
+                else:
+                    kept.append(condition)
+                    results.append(None)
+                    added.append(condition)
+            kept_segments.append(kept)
+            kept_results.append(results)
+
+        self.load(kept_segments)
+        self._results = kept_results
+        for condition in added:
+            self._store(condition, self._run_check(condition))
+        return self.unmet != old_unmet
+
+    def replace_segment(
+        self, segment: int, conditions: list[CompiledCondition]
+    ) -> bool:
+        """
+        Swap the conditions of one segment, keeping the result of every
+        condition that is unchanged and evaluating only the new ones.
+        Returns True when the unmet set changed.
+        """
+        previous = {c.key(): c for c in self._segments[segment]}
+        old_results = self._results[segment]
+        kept: list[CompiledCondition] = []
+        results: list[str | None] = []
+        added: list[CompiledCondition] = []
+        for condition in conditions:
+            existing = previous.pop(condition.key(), None)
+            if existing is not None:
+                kept.append(existing)
+                results.append(old_results[self._positions[existing][1]])
+            else:
+                kept.append(condition)
+                results.append(None)
+                added.append(condition)
+
+        changed = False
+        for condition in previous.values():
+            if old_results[self._positions.pop(condition)[1]] is not None:
+                changed = True
+            self._remove_from_index(condition)
+
+        self._segments[segment] = kept
+        self._results[segment] = results
+        self._gates[segment] = self._shared_gate(kept)
+        for offset, condition in enumerate(kept):
+            self._positions[condition] = (segment, offset)
+        for condition in added:
+            self._add_to_index(condition)
+            if self._store(condition, self._run_check(condition)):
+                changed = True
+        return changed
+
+    def _add_to_index(self, condition: CompiledCondition) -> None:
+        """Index a condition by every entity and template it reads."""
+        if condition.label_template is not None:
+            self._template_index.setdefault(condition.label_template, set()).add(condition)
+        for entity_id in self._entity_ids(condition):
+            self._index.setdefault(entity_id, set()).add(condition)
+
+    def _remove_from_index(self, condition: CompiledCondition) -> None:
+        """Drop a condition from the reverse indexes."""
+        if condition.label_template is not None:
+            self._discard(self._template_index, condition.label_template, condition)
+        for entity_id in self._entity_ids(condition):
+            self._discard(self._index, entity_id, condition)
+
+    @staticmethod
+    def _discard(index: dict, key: str, condition: CompiledCondition) -> None:
+        conditions = index.get(key)
+        if conditions is not None:
+            conditions.discard(condition)
+            if not conditions:
+                del index[key]
+
+    @staticmethod
+    def _shared_gate(
+        conditions: list[CompiledCondition],
+    ) -> tuple[CompiledCondition, ...]:
+        """
+        Return the AND chain every condition of a segment shares, or ().
+        Members compiled by different saves hold equal chains in different
+        tuples; they are pointed at one tuple so they share its memo.
+        """
+        if len(conditions) < 2 or not conditions[0].and_conditions:
+            return ()
+        gate = conditions[0].and_conditions
+        gate_key = None
+        for condition in conditions:
+            if condition.and_conditions is gate:
+                continue
+            if gate_key is None:
+                gate_key = tuple(and_cond.key() for and_cond in gate)
+            if tuple(and_cond.key() for and_cond in condition.and_conditions) != gate_key:
+                return ()
+        if gate_key is not None:
+            for condition in conditions:
+                condition.and_conditions = gate
+        return gate
+
+    @staticmethod
+    def _entity_ids(condition: CompiledCondition) -> set[str]:
+        entity_ids = {condition.entity_id}
+        for and_cond in condition.and_conditions:
+            entity_ids.add(and_cond.entity_id)
+        entity_ids.discard("")
+        return entity_ids
+
+    def reads(self, entity_id: str) -> bool:
+        """Return True if a loaded condition reads entity_id."""
+        return entity_id in self._index
+
+    @property
+    def tracked_entity_ids(self) -> set[str]:
+        """Return every entity_id read by a loaded condition."""
+        return set(self._index)
+
+    @property
+    def unmet(self) -> list[str]:
+        """Return the labels of unmet conditions in condition order."""
+        return list(filter(None, chain.from_iterable(self._results)))
+
+    # ── Evaluation ───────────────────────────────────────────────────────
+
+    def evaluate_all(self) -> None:
+        """Re-check every loaded condition."""
+        check = self._run_check
+        and_passes = self._and_passes
+        results = []
+        for conditions, gate in zip(self._segments, self._gates):
+            if gate and not and_passes(gate):
+                # The group's AND chain fails: no member can be unmet
+                results.append([None] * len(conditions))
+            else:
+                results.append([check(condition) for condition in conditions])
+        self._results = results
+
+    def evaluate_entities(self, entity_ids: Iterable[str]) -> bool:
+        """
+        Re-check only the conditions that read one of entity_ids.
+        Returns True when the unmet set changed.
+        """
+        affected: set[CompiledCondition] = set()
+        for entity_id in entity_ids:
+            affected.update(self._index.get(entity_id, ()))
+        return self._recheck(affected)
+
+    def evaluate_templates(self, template_strs: Iterable[str]) -> bool:
+        """
+        Re-check only the conditions whose label template re-rendered.
+        Returns True when the unmet set changed.
+        """
+        affected: set[CompiledCondition] = set()
+        for template_str in template_strs:
+            affected.update(self._template_index.get(template_str, ()))
+        return self._recheck(affected)
+
+    def _recheck(self, conditions: Iterable[CompiledCondition]) -> bool:
+        """Re-check the given conditions, a segment at a time."""
+        by_segment: dict[int, list[CompiledCondition]] = {}
+        positions = self._positions
+        for condition in conditions:
+            by_segment.setdefault(positions[condition][0], []).append(condition)
+
+        check = self._run_check
+        changed = False
+        for segment, affected in by_segment.items():
+            gate = self._gates[segment]
+            if gate and not self._and_passes(gate):
+                # The group's AND chain fails: no member can be unmet
+                results = self._results[segment]
+                if any(result is not None for result in results):
+                    self._results[segment] = [None] * len(results)
+                    changed = True
+                continue
+            for condition in affected:
+                if self._store(condition, check(condition)):
+                    changed = True
+        return changed
+
+    def _store(self, condition: CompiledCondition, result: str | None) -> bool:
+        """Record a result. Returns True if it differs from the previous one."""
+        segment, offset = self._positions[condition]
+        results = self._results[segment]
+        if results[offset] == result:
+            return False
+        results[offset] = result
+        return True
+
+    # ── Profiling ────────────────────────────────────────────────────────
+
+    def start_sampling(self, sampler: Sampler, owner: str) -> None:
+        """
+        Mark every check with its segment on sampler until stop_sampling(),
+        so samples taken during a check count for that condition of owner.
+        The unmarked path is untouched.
+        """
+        check = self._check
+
+        def _marked_check(condition: CompiledCondition) -> str | None:
+            previous = sampler.current
+            position = self._positions.get(condition)
+            sampler.current = (owner, "check", (position[0],) if position else ())
+            try:
+                return check(condition)
+            finally:
+                sampler.current = previous
+
+        self._run_check = _marked_check
+
+    def stop_sampling(self) -> None:
+        """Return to the unmarked check."""
+        self._run_check = self._check
+
+    def segments_reading(self, entity_ids: Iterable[str]) -> tuple[int, ...]:
+        """Return the segments with a condition that reads one of entity_ids."""
+        return self._segments_of(self._index, entity_ids)
+
+    def segments_rendering(self, template_strs: Iterable[str]) -> tuple[int, ...]:
+        """Return the segments with a condition labelled by one of template_strs."""
+        return self._segments_of(self._template_index, template_strs)
+
+    def _segments_of(
+        self, index: dict[str, set[CompiledCondition]], keys: Iterable[str]
+    ) -> tuple[int, ...]:
+        positions = self._positions
+        return tuple(sorted({
+            positions[condition][0] for key in keys for condition in index.get(key, ())
+        }))
+
+    def _check(self, condition: CompiledCondition) -> str | None:
+        """Return the alert label when the condition is unmet, else None."""
+        self.checks += 1
+        entity_id = condition.entity_id
+        if not entity_id:
+            return None
+
+        # The memoised AND chain first: it is usually shared and cached
+        if condition.and_conditions and not self._and_passes(condition.and_conditions):
+            return None
+
+        state_obj = self._hass.states.get(entity_id)
+        if state_obj is None or state_obj.state in UNAVAILABLE_STATES:
+            return None
+        if not condition.predicate.test(state_obj):
+            return None
+
+        # Resolve label — supports Jinja2 templates
+        if condition.label_template is not None:
+            label = self._label_for(condition.label_template, condition.label_fallback)
+        else:
+            label = condition.name or state_obj.attributes.get("friendly_name", entity_id)
+
+        if label and label.strip():
+            return label
+        return None
+
+    def _and_passes(self, and_conditions: tuple[CompiledCondition, ...]) -> bool:
+        """
+        Return True when every AND sub-condition holds. A sub-condition is
+        only tested again once its entity has a new State object, which
+        Home Assistant creates whenever last_updated changes.
+        """
+        states = self._hass.states
+        memo = self._and_memo
+        for and_cond in and_conditions:
+            state_obj = states.get(and_cond.entity_id)
+            cached = memo.get(and_cond)
+            if cached is not None and cached[0] is state_obj:
+                passed = cached[1]
+            else:
+                passed = (
+                    state_obj is not None
+                    and state_obj.state not in UNAVAILABLE_STATES
+                    and and_cond.predicate.test(state_obj)
+                )
+                memo[and_cond] = (state_obj, passed)
+            if not passed:
+                return False
+        return True
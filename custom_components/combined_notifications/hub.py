@@ -0,0 +1,205 @@
+"""Shared state subscription hub for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import logging
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+
+from .const import DOMAIN
+from .matcher import KeywordMatcher
+
+_LOGGER = logging.getLogger(__name__)
+
+HUB_KEY = "_hub"
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> SubscriptionHub:
+    """Return the domain-wide hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(HUB_KEY)
+    if hub is None:
+        hub = domain_data[HUB_KEY] = SubscriptionHub(hass)
+    return hub
+
+
+class SubscriptionHub:
+    """
+    One state change subscription per entity, shared by every sensor.
+
+    Sensors register per entity with reference-counted subscribe and
+    unsubscribe calls. The hub keeps a single state_changed listener that
+    is filtered on the subscribed entity_ids, so each change is received
+    once and dispatched only to the sensors that track that entity. Entity
+    lifecycle events (created, removed, renamed) used for smart group
+    membership are received once here as well, and the smart group keywords
+    of every sensor share one KeywordMatcher.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        self._subscribers: dict[str, list[Callable[[Event], None]]] = {}
+        self._lifecycle_subscribers: list[Callable[[str, State | None], None]] = []
+        self._state_unsub: CALLBACK_TYPE | None = None
+        self._lifecycle_unsubs: list[CALLBACK_TYPE] = []
+        self._keywords: dict[object, frozenset[str]] = {}
+        self._matcher = KeywordMatcher(())
+        # Last classification, reused while one event fans out to every sensor
+        self._last_classified: tuple[str, str, frozenset[str]] | None = None
+
+    # ── State changes ────────────────────────────────────────────────────
+
+    @callback
+    def async_subscribe(self, entity_id: str, action: Callable[[Event], None]) -> None:
+        """Add a reference from action to entity_id."""
+        subscribers = self._subscribers.get(entity_id)
+        if subscribers is None:
+            self._subscribers[entity_id] = [action]
+        else:
+            subscribers.append(action)
+        if self._state_unsub is None:
+            self._state_unsub = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_dispatch,
+                event_filter=self._async_is_subscribed,
+            )
+
+    @callback
+    def async_unsubscribe(self, entity_id: str, action: Callable[[Event], None]) -> None:
+        """Drop one reference from action to entity_id."""
+        subscribers = self._subscribers.get(entity_id)
+        if not subscribers:
+            return
+        try:
+            subscribers.remove(action)
+        except ValueError:
+            return
+        if not subscribers:
+            del self._subscribers[entity_id]
+        if not self._subscribers and self._state_unsub is not None:
+            self._state_unsub()
+            self._state_unsub = None
+
+    def subscriber_count(self, entity_id: str) -> int:
+        """Return how many references entity_id currently has."""
+        return len(self._subscribers.get(entity_id, ()))
+
+    @property
+    def entity_count(self) -> int:
+        """Return how many entities have at least one subscriber."""
+        return len(self._subscribers)
+
+    @callback
+    def _async_is_subscribed(self, event_data) -> bool:
+        return event_data["entity_id"] in self._subscribers
+
+    @callback
+    def _async_dispatch(self, event: Event) -> None:
+        for action in list(self._subscribers.get(event.data["entity_id"], ())):
+            try:
+                action(event)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error dispatching state change for %s", event.data["entity_id"])
+
+    # ── Smart group keywords ─────────────────────────────────────────────
+
+    @callback
+    def async_set_keywords(self, owner: object, keywords: Iterable[str]) -> None:
+        """
+        Register the smart group keywords of owner, replacing its previous
+        ones. The shared matcher is only rebuilt when the union changes.
+        """
+        keywords = frozenset(k for k in keywords if k)
+        if keywords:
+            self._keywords[owner] = keywords
+        else:
+            self._keywords.pop(owner, None)
+        union = frozenset().union(*self._keywords.values())
+        if union != self._matcher.keywords:
+            _LOGGER.debug("Rebuilding keyword matcher with %d keywords", len(union))
+            self._matcher = KeywordMatcher(union)
+            self._last_classified = None
+
+    @callback
+    def async_release_keywords(self, owner: object) -> None:
+        """Drop every keyword registered by owner."""
+        self.async_set_keywords(owner, ())
+
+    def classify(self, entity_id: str, friendly_name: str) -> frozenset[str]:
+        """Return every registered keyword found in entity_id or friendly_name."""
+        last = self._last_classified
+        if last is not None and last[0] == entity_id and last[1] == friendly_name:
+            return last[2]
+        # One scan over both strings; the separator never occurs in a keyword.
+        found = self._matcher.find(f"{entity_id}\x00{friendly_name}".lower())
+        self._last_classified = (entity_id, friendly_name, found)
+        return found
+
+    # ── Entity lifecycle ─────────────────────────────────────────────────
+
+    @callback
+    def async_track_lifecycle(
+        self, action: Callable[[str, State | None], None]
+    ) -> CALLBACK_TYPE:
+        """
+        Call action(entity_id, state) whenever an entity is created, removed
+        or renamed. state is None for a removed entity.
+        """
+        self._lifecycle_subscribers.append(action)
+        if not self._lifecycle_unsubs:
+            self._lifecycle_unsubs = [
+                self._hass.bus.async_listen(
+                    EVENT_STATE_CHANGED,
+                    self._async_state_lifecycle,
+                    event_filter=self._async_is_lifecycle_event,
+                ),
+                self._hass.bus.async_listen(
+                    EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_lifecycle
+                ),
+            ]
+
+        @callback
+        def _remove() -> None:
+            self._lifecycle_subscribers.remove(action)
+            if not self._lifecycle_subscribers:
+                for unsub in self._lifecycle_unsubs:
+                    unsub()
+                self._lifecycle_unsubs = []
+
+        return _remove
+
+    @staticmethod
+    @callback
+    def _async_is_lifecycle_event(event_data) -> bool:
+        """Pass state events that create, remove or rename an entity."""
+        old_state = event_data["old_state"]
+        new_state = event_data["new_state"]
+        if old_state is None or new_state is None:
+            return True
+        return old_state.attributes.get("friendly_name") != new_state.attributes.get(
+            "friendly_name"
+        )
+
+    @callback
+    def _async_state_lifecycle(self, event: Event) -> None:
+        self._async_notify_lifecycle(event.data["entity_id"], event.data["new_state"])
+
+    @callback
+    def _async_registry_lifecycle(self, event: Event) -> None:
+        """Handle entity registry creates, removes and entity_id renames."""
+        for key in ("old_entity_id", "entity_id"):
+            if entity_id := event.data.get(key):
+                self._async_notify_lifecycle(entity_id, self._hass.states.get(entity_id))
+
+    @callback
+    def _async_notify_lifecycle(self, entity_id: str, state_obj: State | None) -> None:
+        for action in list(self._lifecycle_subscribers):
+            try:
+                action(entity_id, state_obj)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error updating smart group membership for %s", entity_id)
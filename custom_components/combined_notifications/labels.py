@@ -0,0 +1,133 @@
+"""Tracked label templates for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import logging
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    TrackTemplateResultInfo,
+    async_track_template_result,
+)
+from homeassistant.helpers.template import Template
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LabelTemplateCache:
+    """
+    Compile each dynamic label template once and keep its rendered result.
+
+    Templates are tracked with HA's template-result tracking, so a label is
+    only re-rendered when an entity the template reads changes. Conditions
+    look their label up here instead of rendering on every evaluation.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        on_change: Callable[[set[str]], None],
+    ) -> None:
+        """Initialize the cache. on_change receives the changed template strings."""
+        self._hass = hass
+        self._on_change = on_change
+        self._templates: dict[str, Template] = {}
+        # template string -> rendered label, None when rendering failed
+        self._labels: dict[str, str | None] = {}
+        self._tracker: TrackTemplateResultInfo | None = None
+        # Template strings the running tracker follows
+        self._tracked: frozenset[str] = frozenset()
+        # Templates rendered since creation, on load or by the tracker
+        self.renders = 0
+
+    def load(self, template_strs: Iterable[str]) -> None:
+        """Compile and render the given templates, reusing unchanged ones."""
+        templates: dict[str, Template] = {}
+        labels: dict[str, str | None] = {}
+        for template_str in template_strs:
+            if template_str in templates:
+                continue
+            if template_str in self._templates:
+                templates[template_str] = self._templates[template_str]
+                labels[template_str] = self._labels.get(template_str)
+                continue
+            template = Template(template_str, self._hass)
+            self.renders += 1
+            try:
+                template.ensure_valid()
+                labels[template_str] = self._to_label(template.async_render())
+            except TemplateError as err:
+                _LOGGER.debug("Label template render failed: %s — using fallback", err)
+                labels[template_str] = None
+            templates[template_str] = template
+        self._templates = templates
+        self._labels = labels
+
+    def get(self, template_str: str, fallback: str) -> str:
+        """Return the cached label, or fallback if rendering failed."""
+        label = self._labels.get(template_str)
+        return fallback if label is None else label
+
+    @staticmethod
+    def _to_label(result) -> str | None:
+        """Normalise a render result the way labels are displayed."""
+        return str(result).strip() if result is not None else None
+
+    # ── Tracking ─────────────────────────────────────────────────────────
+
+    @callback
+    def async_track(self) -> None:
+        """
+        (Re)start tracking the dependencies of every loaded template.
+        A tracker that already follows exactly these templates is kept.
+        """
+        if self._tracker is not None and self._tracked == self._templates.keys():
+            return
+        self.async_untrack()
+        if not self._templates:
+            return
+        self._tracker = async_track_template_result(
+            self._hass,
+            [TrackTemplate(template, None) for template in self._templates.values()],
+            self._async_template_changed,
+        )
+        self._tracked = frozenset(self._templates)
+
+    @property
+    def tracked_count(self) -> int:
+        """Return how many templates the running tracker follows."""
+        return len(self._tracked)
+
+    @callback
+    def async_untrack(self) -> None:
+        """Stop tracking."""
+        if self._tracker is not None:
+            self._tracker.async_remove()
+            self._tracker = None
+        self._tracked = frozenset()
+
+    @callback
+    def _async_template_changed(
+        self, event: Event | None, updates: list[TrackTemplateResult]
+    ) -> None:
+        """Store re-rendered labels and report the ones that changed."""
+        changed: set[str] = set()
+        self.renders += len(updates)
+        for update in updates:
+            template_str = update.template.template
+            if isinstance(update.result, TemplateError):
+                _LOGGER.debug(
+                    "Label template render failed: %s — using fallback", update.result
+                )
+                label = None
+            else:
+                label = self._to_label(update.result)
+            if self._labels.get(template_str) != label:
+                self._labels[template_str] = label
+                changed.add(template_str)
+        if changed:
+            self._on_change(changed)
@@ -0,0 +1,32 @@
+"""Multi-keyword matcher for smart groups."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+_NO_MATCH: frozenset[str] = frozenset()
+
+
+class KeywordMatcher:
+    """
+    Find every keyword of a set in a text.
+
+    One substring test per keyword. A single regex alternation of all
+    keywords looks cheaper, but Python's re tries the alternatives one by
+    one at every position; it measured 1.1-2.2x slower than this loop at
+    every count from 2 to 1000 keywords and no faster with one (see
+    benchmarks/bench_matcher.py). Overlapping keywords ("door" in
+    "doorbell") need no special handling.
+    """
+
+    __slots__ = ("keywords", "_ordered")
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """Prepare the matcher. Keywords are lowercased; empty ones are ignored."""
+        self.keywords = frozenset(k.lower() for k in keywords if k)
+        self._ordered = tuple(sorted(self.keywords))
+
+    def find(self, text: str) -> frozenset[str]:
+        """Return the keywords contained in text (text must be lowercase)."""
+        found = [keyword for keyword in self._ordered if keyword in text]
+        return frozenset(found) if found else _NO_MATCH
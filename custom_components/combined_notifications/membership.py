@@ -0,0 +1,217 @@
+"""Smart group membership index for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, State, callback
+
+from .const import DOMAIN_GROUPS, RELEVANT_DOMAINS
+from .hub import SubscriptionHub
+from .matcher import KeywordMatcher
+
+# Domain -> its named domain group; any other domain is in "Other"
+_GROUP_OF_DOMAIN = {
+    domain: group
+    for group, domains in DOMAIN_GROUPS.items()
+    if group != "Other"
+    for domain in domains
+}
+
+
+class SmartGroupMembership:
+    """Persistent member list of one smart group condition."""
+
+    def __init__(self, condition: dict) -> None:
+        """Initialize from an entity_filter condition."""
+        self.keyword = condition["entity_filter"].lower()
+        self.excluded = frozenset(condition.get("entity_filter_exclude", []))
+        # entity_id -> friendly_name, in hass.states order
+        self.members: dict[str, str] = {}
+
+    def matches(self, entity_id: str, keywords: frozenset[str]) -> bool:
+        """Return True if the entity, whose matched keywords are given, belongs in this group."""
+        return self.keyword in keywords and entity_id not in self.excluded
+
+
+class SmartGroupIndex:
+    """
+    Membership of every smart group of one sensor, built once from
+    hass.states and then kept current entity by entity. Expansion and
+    listener setup read the cached members instead of rescanning states.
+    Entities are classified against the hub's shared keyword matcher, so
+    each one is scanned once whatever the number of groups.
+    """
+
+    def __init__(self, hub: SubscriptionHub) -> None:
+        """Initialize an empty index."""
+        self._hub = hub
+        # Position in the validated condition list -> membership
+        self._groups: dict[int, SmartGroupMembership] = {}
+        # Keyword -> memberships using it
+        self._by_keyword: dict[str, list[SmartGroupMembership]] = {}
+
+    def load(self, hass: HomeAssistant, conditions: list[dict]) -> None:
+        """
+        Create a membership per smart group and fill the new ones in one
+        pass. A group whose keyword and exclusions are unchanged since the
+        previous load keeps its members without a sweep.
+        """
+        previous = {
+            (group.keyword, group.excluded): group for group in self._groups.values()
+        }
+        self._groups = {}
+        fresh: list[SmartGroupMembership] = []
+        for position, condition in enumerate(conditions):
+            if "entity_filter" not in condition:
+                continue
+            group = SmartGroupMembership(condition)
+            existing = previous.pop((group.keyword, group.excluded), None)
+            if existing is not None:
+                group = existing
+            else:
+                fresh.append(group)
+            self._groups[position] = group
+
+        self._by_keyword = {}
+        for group in self._groups.values():
+            if group.keyword:
+                self._by_keyword.setdefault(group.keyword, []).append(group)
+        self._hub.async_set_keywords(self, self._by_keyword)
+        if fresh:
+            self._sweep(hass, fresh)
+
+    @callback
+    def async_release(self) -> None:
+        """Withdraw this index's keywords from the shared matcher."""
+        self._hub.async_release_keywords(self)
+
+    def async_rebuild(self, hass: HomeAssistant) -> None:
+        """Recompute every membership with a single sweep of hass.states."""
+        groups = list(self._groups.values())
+        for group in groups:
+            group.members.clear()
+        self._sweep(hass, groups)
+
+    def _sweep(self, hass: HomeAssistant, groups: list[SmartGroupMembership]) -> None:
+        """Fill the given memberships with a single sweep of hass.states."""
+        by_keyword: dict[str, list[SmartGroupMembership]] = {}
+        for group in groups:
+            if group.keyword:
+                by_keyword.setdefault(group.keyword, []).append(group)
+        if not by_keyword:
+            return
+
+        classify = self._hub.classify
+        for state_obj in hass.states.async_all():
+            # Only count domains the panel can also display. This keeps the
+            # invariant that anything the sensor counts is visible/toggleable
+            # in the panel — no counted-but-hidden entities.
+            if state_obj.domain not in RELEVANT_DOMAINS:
+                continue
+            entity_id = state_obj.entity_id
+            friendly_name = state_obj.attributes.get("friendly_name", entity_id)
+            for keyword in classify(entity_id, friendly_name):
+                for group in by_keyword.get(keyword, ()):
+                    if entity_id not in group.excluded:
+                        group.members[entity_id] = friendly_name
+
+    def async_update_entity(
+        self, entity_id: str, state_obj: State | None
+    ) -> list[int]:
+        """
+        Add, drop or rename one entity in every membership.
+        Pass state_obj=None for a removed entity. Returns the condition
+        positions of the groups whose members changed.
+        """
+        friendly_name = None
+        keywords: frozenset[str] = frozenset()
+        if state_obj is not None and state_obj.domain in RELEVANT_DOMAINS:
+            friendly_name = state_obj.attributes.get("friendly_name", entity_id)
+            keywords = self._hub.classify(entity_id, friendly_name)
+
+        changed = []
+        for position, group in self._groups.items():
+            if group.matches(entity_id, keywords):
+                if group.members.get(entity_id) != friendly_name:
+                    group.members[entity_id] = friendly_name
+                    changed.append(position)
+            elif group.members.pop(entity_id, None) is not None:
+                changed.append(position)
+        return changed
+
+    def members(self, position: int) -> dict[str, str]:
+        """Return entity_id -> friendly_name for the group at position."""
+        group = self._groups.get(position)
+        return group.members if group else {}
+
+    def sizes(self) -> list[dict[str, Any]]:
+        """Return the keyword and member count of every group, in condition order."""
+        return [
+            {"position": position, "keyword": group.keyword, "members": len(group.members)}
+            for position, group in sorted(self._groups.items())
+        ]
+
+    def all_member_ids(self) -> set[str]:
+        """Return the union of every group's members."""
+        entity_ids: set[str] = set()
+        for group in self._groups.values():
+            entity_ids.update(group.members)
+        return entity_ids
+
+
+def domain_group(domain: str) -> str:
+    """Return the domain group chip an entity domain is shown under."""
+    return _GROUP_OF_DOMAIN.get(domain, "Other")
+
+
+def preview_smart_groups(
+    hass: HomeAssistant, groups: list[dict]
+) -> list[dict[str, Any]]:
+    """
+    Return the members and counts of smart group definitions that may not
+    be saved yet, with one sweep of hass.states for all of them.
+
+    Entities are matched exactly as SmartGroupIndex does, but excluded ones
+    are kept: the panel lists them switched off. Each result holds the
+    sorted member ids, the total, included and excluded counts, and the same
+    counts per domain group, in DOMAIN_GROUPS order.
+    """
+    keywords = [(group.get("entity_filter") or "").lower() for group in groups]
+    matcher = KeywordMatcher(keywords)
+    members: dict[str, list[str]] = {keyword: [] for keyword in keywords if keyword}
+    if members:
+        for state_obj in hass.states.async_all():
+            if state_obj.domain not in RELEVANT_DOMAINS:
+                continue
+            entity_id = state_obj.entity_id
+            friendly_name = state_obj.attributes.get("friendly_name", entity_id)
+            for keyword in matcher.find(f"{entity_id}\x00{friendly_name}".lower()):
+                members[keyword].append(entity_id)
+    for entity_ids in members.values():
+        entity_ids.sort()
+
+    results = []
+    for keyword, group in zip(keywords, groups):
+        excluded = frozenset(group.get("entity_filter_exclude") or ())
+        entity_ids = members.get(keyword, [])
+        by_group: dict[str, dict[str, int]] = {}
+        for entity_id in entity_ids:
+            counts = by_group.setdefault(
+                domain_group(entity_id.partition(".")[0]), {"total": 0, "included": 0}
+            )
+            counts["total"] += 1
+            if entity_id not in excluded:
+                counts["included"] += 1
+        included = sum(counts["included"] for counts in by_group.values())
+        results.append({
+            "keyword": keyword,
+            "members": entity_ids,
+            "total": len(entity_ids),
+            "included": included,
+            "excluded": len(entity_ids) - included,
+            "domain_groups": {
+                name: by_group[name] for name in DOMAIN_GROUPS if name in by_group
+            },
+        })
+    return results
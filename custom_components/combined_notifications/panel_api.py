@@ -4,16 +4,54 @@ from __future__ import annotations
 
 import logging
 import json
-import pathlib
 from datetime import timedelta
 from aiohttp import web
 from homeassistant.core import HomeAssistant
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.json import json_bytes
 
-from .const import DOMAIN, RELEVANT_DOMAINS
+from .assets import ASSET_URL, IMMUTABLE_CACHE, PANEL_HTML, PANEL_IFRAME, PANEL_LIT, get_asset
+from .condition_store import async_get_condition_store, entry_config
+from .const import DOMAIN, STATE_FIELDS
+from .panel_states import build_states_payload
+from .search import async_get_search_index
+from .versioning import ContentVersions, async_get_versions
 
 _LOGGER = logging.getLogger(__name__)
 
+# Responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+
+def _if_none_match(request: web.Request) -> set[str]:
+    """Return the entity tags of the request's If-None-Match header."""
+    header = request.headers.get("If-None-Match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+def _conditional_json(
+    request: web.Request,
+    versions: ContentVersions,
+    variant: str,
+    etag: str,
+    build_payload,
+) -> web.Response:
+    """
+    Answer 304 Not Modified when the client already has etag, otherwise
+    the JSON body of this version — built once per version and gzipped
+    when large.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    tags = _if_none_match(request)
+    if etag in tags or "*" in tags:
+        return web.Response(status=304, headers=headers)
+
+    body = versions.body(variant, etag, lambda: json_bytes(build_payload()))
+    response = web.Response(body=body, content_type="application/json", headers=headers)
+    if len(body) >= GZIP_MIN_BYTES:
+        response.enable_compression()
+    return response
+
 
 class CombinedNotificationsConfigView(HomeAssistantView):
     """Handle GET and POST for config."""
@@ -33,7 +71,14 @@ class CombinedNotificationsConfigView(HomeAssistantView):
         if not entry:
             return self.json_message("Entry not found", 404)
 
-        return self.json({"config": dict(entry.data)}, headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
+        versions = async_get_versions(hass)
+        return _conditional_json(
+            request,
+            versions,
+            f"config-{entry_id}",
+            versions.config_etag(entry_id),
+            lambda: {"config": entry_config(hass, entry)},
+        )
 
     async def post(self, request: web.Request) -> web.Response:
         """Save config for an entry."""
@@ -53,7 +98,11 @@ class CombinedNotificationsConfigView(HomeAssistantView):
 
         try:
             new_data = {**entry.data, **body}
+            store = await async_get_condition_store(hass, entry)
+            if "conditions" in new_data:
+                store.async_set_conditions(new_data.pop("conditions"))
             hass.config_entries.async_update_entry(entry, data=new_data)
+            async_get_versions(hass).async_bump_config(entry_id)
 
             sensor = hass.data.get(DOMAIN, {}).get(entry_id)
             if sensor and hasattr(sensor, "async_update_settings"):
@@ -81,9 +130,9 @@ class CombinedNotificationsConfigView(HomeAssistantView):
                     "hide_title": d.get("hide_title", False),
                     "hide_title_alert": d.get("hide_title_alert", False),
                 }
-                await sensor.async_update_settings(settings, d.get("conditions", []))
+                await sensor.async_update_settings(settings, store.conditions)
 
-            return self.json({"success": True})
+            return self.json({"success": True, "conditions": store.conditions})
         except Exception as err:
             _LOGGER.exception("Failed to save config")
             return self.json_message(str(err), 500)
@@ -97,20 +146,73 @@ class CombinedNotificationsStatesView(HomeAssistantView):
     requires_auth = True
 
     async def get(self, request: web.Request) -> web.Response:
-        """Return filtered entity states."""
+        """
+        Return filtered entity states. Accepts the get_states options as
+        query parameters; list values are comma separated.
+        """
         hass: HomeAssistant = request.app["hass"]
+        query = request.rel_url.query
 
-        states = {
-            state.entity_id: {
-                "state": state.state,
-                "attributes": dict(state.attributes),
-                "friendly_name": state.attributes.get("friendly_name", state.entity_id),
-            }
-            for state in hass.states.async_all()
-            if state.domain in RELEVANT_DOMAINS
-        }
+        def _list(key: str) -> list[str] | None:
+            # Every list option is a set, so order and repeats don't matter
+            value = query.get(key)
+            return sorted({item for item in value.split(",") if item}) if value is not None else None
+
+        fields = _list("fields")
+        if fields is not None and not set(fields) <= set(STATE_FIELDS):
+            return self.json_message(f"fields must be among {', '.join(STATE_FIELDS)}", 400)
+        try:
+            offset = int(query.get("offset", 0))
+            limit = int(query["limit"]) if "limit" in query else None
+        except ValueError:
+            return self.json_message("offset and limit must be integers", 400)
+        if offset < 0 or (limit is not None and limit < 1):
+            return self.json_message("offset must be >= 0 and limit >= 1", 400)
+
+        attributes = _list("attributes")
+        domains = _list("domains")
+        prefix = query.get("prefix") or None
+
+        # The options select the payload, so they are part of its version;
+        # requests that differ only in how they spell them share one
+        options = [fields, attributes, domains, prefix, offset, limit]
+        variant = f"states-{json.dumps(options, separators=(',', ':'))}"
+        versions = async_get_versions(hass)
+        return _conditional_json(
+            request,
+            versions,
+            variant,
+            versions.states_etag(variant),
+            lambda: build_states_payload(
+                hass,
+                fields=fields,
+                attributes=attributes,
+                domains=domains,
+                prefix=prefix,
+                offset=offset,
+                limit=limit,
+            ),
+        )
 
-        return self.json({"states": states}, headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
+
+class CombinedNotificationsSearchView(HomeAssistantView):
+    """Handle GET for the entity picker search."""
+
+    url = "/api/combined_notifications/search"
+    name = "api:combined_notifications:search"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the best ranked entities for ?q=, at most ?limit= (default 50)."""
+        hass: HomeAssistant = request.app["hass"]
+        query = request.rel_url.query.get("q", "")
+        try:
+            limit = min(max(int(request.rel_url.query.get("limit", 50)), 1), 500)
+        except ValueError:
+            return self.json_message("limit must be an integer", 400)
+
+        results = async_get_search_index(hass).search(query, limit)
+        return self.json({"query": query, "results": results}, headers={"Cache-Control": "no-store"})
 
 
 CN_CLIENT_ID = "https://combined-notifications.local"
@@ -154,8 +256,7 @@ class CombinedNotificationsPanelView(HomeAssistantView):
         )
 
         try:
-            html_path = pathlib.Path(__file__).parent / "panel.html"
-            html = await hass.async_add_executor_job(html_path.read_text, "utf-8")
+            html = get_asset(hass, PANEL_HTML).body.decode("utf-8")
         except Exception as e:
             html = f"<h1 style='color:red;padding:40px'>panel.html failed to load:<br>{str(e)}</h1>"
 
@@ -171,7 +272,7 @@ class CombinedNotificationsPanelView(HomeAssistantView):
 
 
 class CombinedNotificationsPanelJSView(HomeAssistantView):
-    """Serve panel JS file."""
+    """Serve panel JS file at its legacy, unhashed URL."""
 
     url = "/api/combined_notifications/panel.js"
     name = "api:combined_notifications:panel_js"
@@ -180,19 +281,36 @@ class CombinedNotificationsPanelJSView(HomeAssistantView):
     async def get(self, request: web.Request) -> web.Response:
         """Serve the panel JavaScript file."""
         hass: HomeAssistant = request.app["hass"]
-        js_path = pathlib.Path(__file__).parent / "panel_iframe.js"
-        data = await hass.async_add_executor_job(js_path.read_bytes)
-        return web.Response(
-            body=data,
-            content_type="application/javascript",
-            headers={"Cache-Control": "no-cache"},
-        )
+        return get_asset(hass, PANEL_IFRAME).response(request, "no-cache")
+
+
+class CombinedNotificationsAssetView(HomeAssistantView):
+    """Serve the panel scripts from memory at content-hashed URLs."""
+
+    url = ASSET_URL + "/{filename}"
+    name = "combined_notifications:asset"
+    requires_auth = False
+
+    async def get(self, request: web.Request, filename: str) -> web.Response:
+        """Serve a hashed script for good; a stale hash gets the current one."""
+        hass: HomeAssistant = request.app["hass"]
+        for name in (PANEL_LIT, PANEL_IFRAME):
+            asset = get_asset(hass, name)
+            if filename == asset.hashed_name:
+                return asset.response(request, IMMUTABLE_CACHE)
+            stem, _, suffix = name.rpartition(".")
+            if filename.startswith(stem + ".") and filename.endswith("." + suffix):
+                # Page loaded before an upgrade: current content, not cached
+                return asset.response(request, "no-cache")
+        raise web.HTTPNotFound()
 
 
 def async_register_views(hass: HomeAssistant) -> None:
     """Register REST API views."""
     hass.http.register_view(CombinedNotificationsPanelView)
     hass.http.register_view(CombinedNotificationsPanelJSView)
+    hass.http.register_view(CombinedNotificationsAssetView)
     hass.http.register_view(CombinedNotificationsConfigView)
     hass.http.register_view(CombinedNotificationsStatesView)
+    hass.http.register_view(CombinedNotificationsSearchView)
     _LOGGER.debug("Combined Notifications API views registered")
@@ -30,6 +30,10 @@ const COLOR_CSS = Object.fromEntries(COLORS.map(c => [c.value, c.css]));
 const OPERATORS = ["equals", "not equal to", "greater than", "less than"];
 const OPERATOR_LABEL_TO_SYMBOL = { "equals": "==", "not equal to": "!=", "greater than": ">", "less than": "<" };
 const OPERATOR_SYMBOL_TO_LABEL = { "==": "equals", "!=": "not equal to", ">": "greater than", "<": "less than" };
+// Projection requested from the states endpoint: the panel only reads these,
+// plus the status attributes of its own sensor.
+const STATE_FIELDS = ["state", "friendly_name", "attributes"];
+const STATE_ATTRIBUTES = ["is_clear", "number_unmet"];
 
 const DOMAIN_GROUPS = {
   "Sensors":  ["sensor", "binary_sensor", "input_boolean", "input_select", "input_number", "input_text", "input_datetime", "counter", "timer"],
@@ -164,6 +168,7 @@ let _allEntityList = [];
 let _activeTab = "general";
 let _expandedConditions = new Set();
 let _entitySearch = {};
+let _searchResults = {};
 let _groupViewFilter = {};
 let _backupMsg = "";
 let _saving = false;
@@ -227,7 +232,7 @@ async function loadStates() {
   try {
     const token = getAccessToken();
     if (!token) throw new Error("No access token available — reopen the panel");
-    const resp = await fetch(`/api/combined_notifications/states`, {
+    const resp = await fetch(`/api/combined_notifications/states?fields=${STATE_FIELDS.join(",")}&attributes=${STATE_ATTRIBUTES.join(",")}`, {
       headers: { Authorization: `Bearer ${token}` },
     });
     if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
@@ -255,6 +260,28 @@ async function loadStates() {
   _statesLoading = false;
 }
 
+async function searchEntities(pickerId, query) {
+  if (!query) {
+    _searchResults = { ..._searchResults, [pickerId]: { query, results: [] } };
+    return;
+  }
+  try {
+    const token = getAccessToken();
+    if (!token) throw new Error("No access token available — reopen the panel");
+    const resp = await fetch(`/api/combined_notifications/search?q=${encodeURIComponent(query)}&limit=50`, {
+      headers: { Authorization: `Bearer ${token}` },
+    });
+    if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+    const result = await resp.json();
+    // Drop answers to queries the user has already typed past
+    if (_entitySearch[pickerId] !== query) return;
+    _searchResults = { ..._searchResults, [pickerId]: result };
+    render();
+  } catch (e) {
+    console.error("CN Panel: entity search failed:", e);
+  }
+}
+
 async function saveConfig() {
   _saving = true;
   _saved = false;
@@ -280,6 +307,11 @@ async function saveConfig() {
       body: JSON.stringify({ ..._config, conditions }),
     });
     if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+    // Adopt the ids the store gave new conditions; they key the cards
+    const saved = (await resp.json()).conditions || [];
+    if (_config.conditions && saved.length === _config.conditions.length) {
+      _config.conditions = _config.conditions.map((c, i) => ({ ...c, id: saved[i].id }));
+    }
     _saved = true;
   } catch (e) {
     _error = `Failed to save: ${e.message}`;
@@ -398,22 +430,106 @@ function bigToggleStyle(on) {
 // Render
 // ---------------------------------------------------------------------------
 
+// The markup is rebuilt as a string, but applied to the live DOM by
+// difference: unchanged nodes stay, so a render costs what changed rather
+// than a teardown of every row, and focus and scroll positions survive.
+function patchDom(target, html) {
+  const next = document.createElement(target.nodeName);
+  next.innerHTML = html;
+  patchChildren(target, next);
+}
+
+// Rows carry data-key (condition id, entity_id): a keyed node is only ever
+// reused for the same key, so a removed row's element never takes over the
+// next row's slot. Unkeyed nodes are matched by position among themselves.
+function nodeKey(node) {
+  return node.nodeType === Node.ELEMENT_NODE ? node.getAttribute("data-key") : null;
+}
+
+function patchChildren(target, source) {
+  const current = [...target.childNodes];
+  const keyed = new Map();
+  const unkeyed = [];
+  for (const node of current) {
+    const key = nodeKey(node);
+    if (key === null) unkeyed.push(node);
+    else keyed.set(key, node);
+  }
+  const kept = new Set();
+  let position = 0;
+  [...source.childNodes].forEach((node, i) => {
+    const key = nodeKey(node);
+    let existing = key === null ? unkeyed[position++] : keyed.get(key);
+    if (existing && (existing.nodeType !== node.nodeType || existing.nodeName !== node.nodeName)) {
+      existing = undefined;
+    }
+    const slot = target.childNodes[i] || null;
+    if (!existing) {
+      target.insertBefore(node, slot);
+      return;
+    }
+    kept.add(existing);
+    if (node.nodeType === Node.ELEMENT_NODE) {
+      patchElement(existing, node);
+    } else if (existing.nodeValue !== node.nodeValue) {
+      existing.nodeValue = node.nodeValue;
+    }
+    if (existing !== slot) target.insertBefore(existing, slot);
+  });
+  for (const node of current) {
+    if (!kept.has(node) && node.parentNode === target) target.removeChild(node);
+  }
+}
+
+function patchElement(el, next) {
+  // attachEvents() binds again whatever still matches its selectors
+  clearHandlers(el);
+  for (const { name } of [...el.attributes]) {
+    if (!next.hasAttribute(name)) el.removeAttribute(name);
+  }
+  for (const { name, value } of [...next.attributes]) {
+    if (el.getAttribute(name) !== value) el.setAttribute(name, value);
+  }
+  patchChildren(el, next);
+  // Form controls keep what the user is typing; others follow the markup
+  if (el !== document.activeElement && "value" in el && (el.nodeName === "INPUT" || el.nodeName === "TEXTAREA" || el.nodeName === "SELECT")) {
+    if (el.value !== next.value) el.value = next.value;
+    if (el.checked !== next.checked) el.checked = next.checked;
+  }
+}
+
+// Bind a listener once per element and event: a patched render keeps the
+// elements, so the handler from the previous render is replaced, not added to.
+function clearHandlers(el) {
+  for (const [type, handler] of Object.entries(el._cnHandlers || {})) {
+    el.removeEventListener(type, handler);
+  }
+  el._cnHandlers = null;
+}
+
+function on(el, type, handler) {
+  const handlers = el._cnHandlers || (el._cnHandlers = {});
+  if (handlers[type]) el.removeEventListener(type, handlers[type]);
+  handlers[type] = handler;
+  el.addEventListener(type, handler);
+}
+
 function render() {
   const app = document.getElementById("cn-app");
   if (!app) return;
   console.log('%cCN Panel: render() called', 'color:#63b3ed');
 
   if (!_config) {
-    app.innerHTML = `
+    patchDom(app, `
       <div style="min-height:100vh;background:#080a0f;display:flex;align-items:center;justify-content:center;font-family:'DM Sans',sans-serif;color:#94a3b8;">
         ${_error
           ? `<div style="color:#fc8181;padding:40px;text-align:center">${_error}</div>`
           : `<div style="padding:40px;text-align:center">Loading configuration...</div>`}
-      </div>`;
+      </div>`);
     return;
   }
 
-  app.innerHTML = buildPanel();
+  patchDom(app, buildPanel());
   attachEvents();
 }
 
@@ -720,7 +836,7 @@ function buildConditionCard(condition, index) {
   const dotColor = isAlert ? "#fc8181" : isPaused ? "#f6ad55" : "rgb(47,207,118)";
 
   return `
-    <div style="background:${cardBg};border:1px solid ${cardBorder};${isAlert || isPaused ? `border-left:3px solid ${cardBorder};` : ""}border-radius:8px;overflow:hidden;">
+    <div data-key="${esc(condition.id || `new-${index}`)}" style="background:${cardBg};border:1px solid ${cardBorder};${isAlert || isPaused ? `border-left:3px solid ${cardBorder};` : ""}border-radius:8px;overflow:hidden;">
       <div class="cond-toggle" data-index="${index}" style="display:flex;align-items:center;justify-content:space-between;padding:12px 14px;cursor:pointer;gap:8px;">
         <div style="display:flex;align-items:center;gap:8px;flex:1;min-width:0;overflow:hidden;">
           <div style="width:8px;height:8px;border-radius:50%;flex-shrink:0;background:${dotColor};"></div>
@@ -801,7 +917,7 @@ function buildSmartGroupCard(condition, index) {
   const sgDotColor = isGroupAlert ? "#fc8181" : isPaused ? "#f6ad55" : "rgb(47,207,118)";
 
   return `
-    <div style="background:${sgCardBg};border:1px solid ${sgCardBorder};${isGroupAlert || isPaused ? `border-left:3px solid ${sgCardBorder};` : ""}border-radius:8px;overflow:hidden;opacity:${isPaused ? '0.6' : '1'};">
+    <div data-key="${esc(condition.id || `new-${index}`)}" style="background:${sgCardBg};border:1px solid ${sgCardBorder};${isGroupAlert || isPaused ? `border-left:3px solid ${sgCardBorder};` : ""}border-radius:8px;overflow:hidden;opacity:${isPaused ? '0.6' : '1'};">
       <div class="cond-toggle" data-index="${index}" style="display:flex;align-items:center;justify-content:space-between;padding:12px 14px;cursor:pointer;gap:8px;">
         <div style="display:flex;align-items:center;gap:8px;flex:1;min-width:0;overflow:hidden;">
           <div style="width:8px;height:8px;border-radius:50%;flex-shrink:0;background:${sgDotColor};"></div>
@@ -872,7 +988,7 @@ function buildEntityList(condition, index, allMatched, excl) {
         const isAlerting = !isExcluded && !condition.paused && evalCondition(entityState, condition.operator, condition.trigger_value);
         const rowBg = isAlerting ? "rgba(252,129,129,0.06)" : "transparent";
         const rowBorder = isAlerting ? "border-left:3px solid rgba(252,129,129,0.6);padding-left:9px;" : "";
-        return `<div style="display:flex;align-items:flex-start;justify-content:space-between;padding:12px;border-bottom:1px solid rgba(255,255,255,0.06);opacity:${isExcluded ? "0.6" : "1"};background:${rowBg};${rowBorder}">
+        return `<div data-key="${esc(entityId)}" style="display:flex;align-items:flex-start;justify-content:space-between;padding:12px;border-bottom:1px solid rgba(255,255,255,0.06);opacity:${isExcluded ? "0.6" : "1"};background:${rowBg};${rowBorder}">
           <div style="flex:1;min-width:0;">
             <div style="font-size:0.85rem;color:${isAlerting ? "#fc8181" : "#e2e8f0"};font-weight:500;">${esc(s.friendly_name || entityId)}</div>
             <div style="font-size:0.72rem;color:#64748b;font-family:monospace;margin-top:1px;">${esc(entityId)}</div>
@@ -940,12 +1056,9 @@ function buildEntityPicker(currentEntityId, pickerId) {
     displayName = found ? (found[1].friendly_name || currentEntityId) : currentEntityId;
   }
 
+  // Ranked matches come from the backend search index
   const filtered = isSearching && searchVal && searchVal.length > 0
-    ? _allEntityList.filter(([id, s]) => {
-        const fn = (s.friendly_name || "").toLowerCase();
-        const q = (searchVal || "").toLowerCase();
-        return id.toLowerCase().includes(q) || fn.includes(q);
-      }).slice(0, 50)
+    ? (_searchResults[pickerId]?.results || []).map(r => [r.entity_id, r])
     : [];
 
   return `
@@ -992,28 +1105,28 @@ function attachEvents() {
   if (!app) return;
 
   app.querySelectorAll(".tab-btn").forEach(btn => {
-    btn.addEventListener("click", () => { _activeTab = btn.dataset.tab; render(); });
+    on(btn, "click", () => { _activeTab = btn.dataset.tab; render(); });
   });
 
 
 
   const saveBtn = app.querySelector("#save-btn");
-  if (saveBtn) saveBtn.addEventListener("click", collectAndSave);
+  if (saveBtn) on(saveBtn, "click", collectAndSave);
 
   const cancelBtn = app.querySelector("#cancel-btn");
-  if (cancelBtn) cancelBtn.addEventListener("click", () => window.close());
+  if (cancelBtn) on(cancelBtn, "click", () => window.close());
   const closeBtn = app.querySelector("#close-btn");
-  if (closeBtn) closeBtn.addEventListener("click", () => window.close());
+  if (closeBtn) on(closeBtn, "click", () => window.close());
 
   const exportBtn = app.querySelector("#export-btn");
-  if (exportBtn) exportBtn.addEventListener("click", exportBackup);
+  if (exportBtn) on(exportBtn, "click", exportBackup);
   const importBtn = app.querySelector("#import-btn");
-  if (importBtn) importBtn.addEventListener("click", () => document.getElementById("backup-file-input")?.click());
+  if (importBtn) on(importBtn, "click", () => document.getElementById("backup-file-input")?.click());
   const fileInput = app.querySelector("#backup-file-input");
-  if (fileInput) fileInput.addEventListener("change", importBackup);
+  if (fileInput) on(fileInput, "change", importBackup);
 
   app.querySelectorAll(".big-toggle").forEach(toggle => {
-    toggle.addEventListener("click", () => {
+    on(toggle, "click", () => {
       const key = toggle.id === "f-hide-title" ? "hide_title" : "hide_title_alert";
       _config[key] = !_config[key];
       render();
@@ -1021,7 +1134,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".cond-toggle").forEach(el => {
-    el.addEventListener("click", (e) => {
+    on(el, "click", (e) => {
       if (e.target.closest(".pause-toggle") || e.target.closest(".delete-cond-btn")) return;
       const index = parseInt(el.dataset.index);
       if (_expandedConditions.has(index)) _expandedConditions.delete(index);
@@ -1031,7 +1144,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll("[data-action='toggle-label-template']").forEach(el => {
-    el.addEventListener("click", (e) => {
+    on(el, "click", (e) => {
       e.stopPropagation();
       const index = parseInt(el.dataset.index);
       const conditions = [..._config.conditions];
@@ -1042,7 +1155,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".pause-toggle").forEach(el => {
-    el.addEventListener("click", (e) => {
+    on(el, "click", (e) => {
       e.stopPropagation();
       const index = parseInt(el.dataset.index);
       const conditions = [..._config.conditions];
@@ -1053,7 +1166,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".delete-cond-btn").forEach(btn => {
-    btn.addEventListener("click", (e) => {
+    on(btn, "click", (e) => {
       e.stopPropagation();
       const index = parseInt(btn.dataset.index);
       const conditions = _config.conditions.filter((_, i) => i !== index);
@@ -1065,7 +1178,7 @@ function attachEvents() {
   });
 
   const addIndividual = app.querySelector("#add-individual-btn");
-  if (addIndividual) addIndividual.addEventListener("click", () => {
+  if (addIndividual) on(addIndividual, "click", () => {
     const conditions = [..._config.conditions];
     const newIndex = conditions.length;
     conditions.push({ entity_id: "", operator: "equals", trigger_value: "", name: "", paused: false, and_conditions: [], use_label_template: false, label_template: "", label_fallback: "" });
@@ -1075,7 +1188,7 @@ function attachEvents() {
   });
 
   const addGroup = app.querySelector("#add-group-btn");
-  if (addGroup) addGroup.addEventListener("click", () => {
+  if (addGroup) on(addGroup, "click", () => {
     const conditions = [..._config.conditions];
     const newIndex = conditions.length;
     conditions.push({ entity_filter: "", entity_filter_name: "", operator: "equals", trigger_value: "", paused: false, and_conditions: [], entity_filter_exclude: [], entity_label_overrides: {}, entity_filter_initialized: false });
@@ -1086,20 +1199,22 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".entity-picker-input").forEach(input => {
-    input.addEventListener("focus", () => {
+    on(input, "focus", () => {
       const pickerId = input.dataset.pickerId;
       _entitySearch = { ..._entitySearch, [pickerId]: input.dataset.current || "" };
+      searchEntities(pickerId, input.dataset.current || "");
       render();
     });
-    input.addEventListener("input", () => {
+    on(input, "input", () => {
       const pickerId = input.dataset.pickerId;
       if (_debounceTimer) clearTimeout(_debounceTimer);
       _debounceTimer = setTimeout(() => {
         _entitySearch = { ..._entitySearch, [pickerId]: input.value };
+        searchEntities(pickerId, input.value);
         render();
       }, 180);
     });
-    input.addEventListener("blur", () => {
+    on(input, "blur", () => {
       const pickerId = input.dataset.pickerId;
       setTimeout(() => {
         _entitySearch = { ..._entitySearch, [pickerId]: null };
@@ -1109,15 +1224,15 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".entity-picker-clear").forEach(btn => {
-    btn.addEventListener("click", () => applyPickerSelection(btn.dataset.pickerId, ""));
+    on(btn, "click", () => applyPickerSelection(btn.dataset.pickerId, ""));
   });
 
   app.querySelectorAll(".entity-picker-item").forEach(item => {
-    item.addEventListener("mousedown", () => applyPickerSelection(item.dataset.pickerId, item.dataset.entityId));
+    on(item, "mousedown", () => applyPickerSelection(item.dataset.pickerId, item.dataset.entityId));
   });
 
   app.querySelectorAll(".entity-toggle").forEach(toggle => {
-    toggle.addEventListener("click", () => {
+    on(toggle, "click", () => {
       const condIndex = parseInt(toggle.dataset.condIndex);
       const entityId = toggle.dataset.entityId;
       const conditions = [..._config.conditions];
@@ -1131,7 +1246,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".include-all-btn").forEach(btn => {
-    btn.addEventListener("click", () => {
+    on(btn, "click", () => {
       const condIndex = parseInt(btn.dataset.index);
       const conditions = [..._config.conditions];
       const matched = applyGroupViewFilter(condIndex, matchedEntities(conditions[condIndex]));
@@ -1144,7 +1259,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".exclude-all-btn").forEach(btn => {
-    btn.addEventListener("click", () => {
+    on(btn, "click", () => {
       const condIndex = parseInt(btn.dataset.index);
       const conditions = [..._config.conditions];
       const matched = applyGroupViewFilter(condIndex, matchedEntities(conditions[condIndex]));
@@ -1157,7 +1272,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".domain-chip").forEach(chip => {
-    chip.addEventListener("click", () => {
+    on(chip, "click", () => {
       const condIndex = parseInt(chip.dataset.index);
       const groupName = chip.dataset.group;
       // View filter: show only this group, or clear if tapping the active one.
@@ -1167,7 +1282,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".entity-label").forEach(input => {
-    input.addEventListener("input", () => {
+    on(input, "input", () => {
       const condIndex = parseInt(input.dataset.condIndex);
       const entityId = input.dataset.entityId;
       const conditions = [..._config.conditions];
@@ -1180,7 +1295,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".add-and-btn").forEach(btn => {
-    btn.addEventListener("click", () => {
+    on(btn, "click", () => {
       const condIndex = parseInt(btn.dataset.condIndex);
       const conditions = [..._config.conditions];
       const andConditions = [...(conditions[condIndex].and_conditions || [])];
@@ -1192,7 +1307,7 @@ function attachEvents() {
   });
 
   app.querySelectorAll(".delete-and-btn").forEach(btn => {
-    btn.addEventListener("click", () => {
+    on(btn, "click", () => {
       const condIndex = parseInt(btn.dataset.condIndex);
       const andIndex = parseInt(btn.dataset.andIndex);
       const conditions = [..._config.conditions];
@@ -1205,7 +1320,7 @@ function attachEvents() {
 
   // Smart group keyword — live update so entity list updates as you type
   app.querySelectorAll(".sg-keyword").forEach(input => {
-    input.addEventListener("input", (e) => {
+    on(input, "input", (e) => {
       const index = parseInt(input.dataset.index);
       const val = e.target.value;
       const cursorPos = e.target.selectionStart;
@@ -1239,7 +1354,7 @@ function attachEvents() {
 
   // Smart group name — live update
   app.querySelectorAll(".sg-name").forEach(input => {
-    input.addEventListener("input", (e) => {
+    on(input, "input", (e) => {
       const index = parseInt(input.dataset.index);
       const conditions = [..._config.conditions];
       if (conditions[index]) {
@@ -1251,38 +1366,38 @@ function attachEvents() {
 
   // General inputs
   const nameInput = app.querySelector("#f-name");
-  if (nameInput) nameInput.addEventListener("input", (e) => {
+  if (nameInput) on(nameInput, "input", (e) => {
     const clean = sanitizeName(e.target.value);
     e.target.value = clean;
     _config.name = clean;
   });
   const friendlyInput = app.querySelector("#f-friendly");
-  if (friendlyInput) friendlyInput.addEventListener("input", (e) => { _config.friendly_sensor_name = e.target.value; });
+  if (friendlyInput) on(friendlyInput, "input", (e) => { _config.friendly_sensor_name = e.target.value; });
   const allClearInput = app.querySelector("#f-allclear");
-  if (allClearInput) allClearInput.addEventListener("input", (e) => { _config.text_all_clear = e.target.value; });
+  if (allClearInput) on(allClearInput, "input", (e) => { _config.text_all_clear = e.target.value; });
   // Icon pickers — dropdown select + custom text input
   const iconClearSelect = app.querySelector("#f-icon-clear");
   const iconClearCustom = app.querySelector("#f-icon-clear-custom");
   const iconAlertSelect = app.querySelector("#f-icon-alert");
   const iconAlertCustom = app.querySelector("#f-icon-alert-custom");
 
-  if (iconClearSelect) iconClearSelect.addEventListener("change", (e) => {
+  if (iconClearSelect) on(iconClearSelect, "change", (e) => {
     _config.icon_all_clear = e.target.value;
     if (iconClearCustom) iconClearCustom.value = "";
     render();
   });
-  if (iconClearCustom) iconClearCustom.addEventListener("input", (e) => {
+  if (iconClearCustom) on(iconClearCustom, "input", (e) => {
     if (e.target.value) {
       _config.icon_all_clear = e.target.value;
       render();
     }
   });
-  if (iconAlertSelect) iconAlertSelect.addEventListener("change", (e) => {
+  if (iconAlertSelect) on(iconAlertSelect, "change", (e) => {
     _config.icon_alert = e.target.value;
     if (iconAlertCustom) iconAlertCustom.value = "";
     render();
   });
-  if (iconAlertCustom) iconAlertCustom.addEventListener("input", (e) => {
+  if (iconAlertCustom) on(iconAlertCustom, "input", (e) => {
     if (e.target.value) {
       _config.icon_alert = e.target.value;
       render();
@@ -525,6 +525,7 @@ const CN_STYLES = `
   }
   .add-and:hover { opacity: 0.75; }
   .entity-list { border: 1px solid rgba(255,255,255,0.08); border-radius: 8px; overflow: hidden; }
+  .entity-list-rows { max-height: 480px; overflow-y: auto; }
   .entity-list-header {
     display: flex;
     justify-content: space-between;
@@ -561,7 +562,8 @@ const CN_STYLES = `
     border-bottom: 1px solid rgba(255,255,255,0.06);
     transition: background 0.1s;
   }
-  .entity-item:last-child { border-bottom: none; }
+  .entity-item:last-child:not(cn-list-row > *),
+  cn-list-row:last-of-type > .entity-item { border-bottom: none; }
   .entity-item.excluded { opacity: 0.6; }
   .entity-info { flex: 1; min-width: 0; }
   .entity-name { font-size: 0.85rem; color: #e2e8f0; font-weight: 500; }
@@ -863,7 +865,7 @@ const CN_STYLES = `
     border-top: 1px solid rgba(99,179,237,0.12);
     border-bottom: 1px solid rgba(99,179,237,0.08);
   }
-  .overview-container > .overview-domain-divider:first-of-type { border-top: none; }
+  .overview-container > cn-list-row:first-of-type > .overview-domain-divider { border-top: none; }
   .overview-thead {
     display: grid;
     grid-template-columns: 1fr 100px 90px;
@@ -884,7 +886,8 @@ const CN_STYLES = `
     border-bottom: 1px solid rgba(255,255,255,0.04);
     gap: 8px;
   }
-  .overview-row:last-child { border-bottom: none; }
+  .overview-row:last-child:not(cn-list-row > *),
+  cn-list-row:last-of-type > .overview-row { border-bottom: none; }
   .overview-row.row-alert  { background: rgba(252,129,129,0.06); border-left: 3px solid rgba(252,129,129,0.6); padding-left: 11px; }
   .overview-row.row-paused { background: rgba(246,173,85,0.06);  border-left: 3px solid rgba(246,173,85,0.5);  padding-left: 11px; }
   .overview-row.row-ok     { background: transparent; }
@@ -953,6 +956,11 @@ const OPERATOR_SYMBOL_TO_LABEL = {
   "<":  "less than",
 };
 
+// Projection requested from get_states: the panel only reads these, plus the
+// status attributes of its own sensor.
+const STATE_FIELDS = ["state", "friendly_name", "attributes"];
+const STATE_ATTRIBUTES = ["is_clear", "number_unmet"];
+
 const DOMAIN_GROUPS = {
   "Sensors":    ["sensor", "binary_sensor", "input_boolean", "input_select", "input_number", "input_text", "input_datetime", "counter", "timer"],
   "Lights":     ["light"],
@@ -967,6 +975,29 @@ const DOMAIN_GROUPS = {
   "Other":      ["automation", "script", "scene", "button", "update", "number", "select", "fan", "vacuum", "water_heater", "humidifier"]
 };
 
+// Lists longer than this render only the rows in view, plus an overscan on
+// either side; the rest is stood in for by two spacers.
+const VIRTUAL_THRESHOLD = 60;
+const VIRTUAL_OVERSCAN = 8;
+// Viewport height assumed before a list has been scrolled
+const VIRTUAL_VIEWPORT = 600;
+// Row heights (px) by kind, used until a rendered row has been measured
+const ROW_HEIGHT_ESTIMATES = {
+  "member": 88,
+  "member-excluded": 58,
+  "overview-row": 54,
+  "overview-divider": 27,
+};
+
+// Smart group preview before the backend has answered
+const EMPTY_PREVIEW = { keyword: "", members: [], total: 0, included: 0, excluded: 0, domain_groups: {} };
+
+// JSON with sorted object keys, so equal conditions compare equal
+const stableJson = value => JSON.stringify(value, (key, v) =>
+  v && typeof v === "object" && !Array.isArray(v)
+    ? Object.fromEntries(Object.keys(v).sort().map(k => [k, v[k]]))
+    : v);
+
 // Domains that have an explicit named group (everything NOT in this set is treated as "Other").
 const NAMED_GROUP_DOMAINS = new Set(
   Object.entries(DOMAIN_GROUPS)
@@ -974,6 +1005,38 @@ const NAMED_GROUP_DOMAINS = new Set(
     .flatMap(([, domains]) => domains)
 );
 
+// ---------------------------------------------------------------------------
+// Keyed list row
+// ---------------------------------------------------------------------------
+
+// One row of a scrolling list. The panel keeps a row element per key (see
+// _keyedRows), so a row's elements — and whatever is typed into them — stay
+// with their entity while the list re-renders or the window moves. It
+// renders into the light DOM so the panel's styles apply, and display:
+// contents lays its content out as if it were rendered inline.
+class CnListRow extends LitElement {
+  createRenderRoot() {
+    return this;
+  }
+
+  connectedCallback() {
+    super.connectedCallback();
+    this.style.display = "contents";
+  }
+
+  render() {
+    return this.template;
+  }
+
+  updated() {
+    this.panel?._measureRows();
+  }
+}
+
+if (!customElements.get("cn-list-row")) {
+  customElements.define("cn-list-row", CnListRow);
+}
+
 // ---------------------------------------------------------------------------
 // Main panel element
 // ---------------------------------------------------------------------------
@@ -1019,6 +1082,24 @@ class CombinedNotificationsPanel extends LitElement {
     this._allEntityList = [];
     this._debounceTimer = null;
     this._individualDomainFilter = new Set();
+    this._statesUnsub = null;
+    this._searchResults = {};
+    // preview_smart_groups results, aligned with _config.conditions
+    this._groupPreviews = [];
+    this._previewKey = "";
+    this._previewTimer = null;
+    this._previewSeq = 0;
+    this._interactiveMeasured = false;
+    // Windowed lists: scroll offset, viewport height and measured row heights
+    this._scrollTops = {};
+    this._viewports = {};
+    this._rowHeights = {};
+    this._scrollFrame = null;
+    // Row elements of each list by key, as last rendered
+    this._listRows = {};
+    // Conditions and settings as last saved, to send only what changed
+    this._savedConditions = [];
+    this._savedSettings = "";
   }
 
   get _isExistingSensor() {
@@ -1057,6 +1138,113 @@ class CombinedNotificationsPanel extends LitElement {
     this._injectStyles();
   }
 
+  update(changedProps) {
+    // A keyed row that moves is re-inserted, which drops the focus of the
+    // input inside it; give the focus and caret back.
+    const active = this.shadowRoot?.activeElement;
+    const caret = active && typeof active.selectionStart === "number"
+      ? [active.selectionStart, active.selectionEnd]
+      : null;
+    super.update(changedProps);
+    if (active && active.isConnected && this.shadowRoot.activeElement !== active) {
+      active.focus({ preventScroll: true });
+      if (caret) active.setSelectionRange(...caret);
+    }
+  }
+
+  updated(changedProps) {
+    if (super.updated) super.updated(changedProps);
+    if (changedProps.has("_config")) {
+      this._schedulePreviews();
+      if (this._config) this._measureInteractive();
+    }
+    this._measureRows();
+  }
+
+  // ── Windowed lists ──────────────────────────────────────────────────────
+
+  _rowHeight(kind) {
+    return this._rowHeights[kind] || ROW_HEIGHT_ESTIMATES[kind];
+  }
+
+  // Replace the height estimate of each row kind by the real one, once
+  _measureRows() {
+    const root = this.renderRoot || this.shadowRoot;
+    if (!root || Object.keys(ROW_HEIGHT_ESTIMATES).every(kind => this._rowHeights[kind])) return;
+    let changed = false;
+    for (const el of root.querySelectorAll("[data-vkind]")) {
+      const kind = el.dataset.vkind;
+      if (!this._rowHeights[kind] && el.offsetHeight > 0) {
+        this._rowHeights[kind] = el.offsetHeight;
+        changed = true;
+      }
+    }
+    if (changed) this.requestUpdate();
+  }
+
+  _onVirtualScroll(listId, e) {
+    const el = e.currentTarget;
+    this._scrollTops[listId] = el.scrollTop;
+    this._viewports[listId] = el.clientHeight;
+    if (this._scrollFrame) return;
+    this._scrollFrame = requestAnimationFrame(() => {
+      this._scrollFrame = null;
+      this.requestUpdate();
+    });
+  }
+
+  // The row element of every item, reusing the element rendered for the same
+  // key last time, as lit's repeat() would. Only the rows rendered now are
+  // kept for the next render.
+  _keyedRows(listId, items, keyOf, renderItem) {
+    const previous = this._listRows[listId] || new Map();
+    const rows = new Map();
+    for (const item of items) {
+      let key = keyOf(item);
+      if (rows.has(key)) key = `${key}\u0000${rows.size}`;
+      let row = previous.get(key);
+      if (!row) {
+        row = document.createElement("cn-list-row");
+        row.panel = this;
+      }
+      row.template = renderItem(item);
+      row.requestUpdate();
+      rows.set(key, row);
+    }
+    this._listRows[listId] = rows;
+    return [...rows.values()];
+  }
+
+  // Render the rows of a scrolling list, keyed by keyOf(item). Short lists
+  // render every row; long ones only those in view, between spacers as tall
+  // as the rows left out. kindOf(item) names the item's row kind, whose
+  // element must carry it as data-vkind so its height can be measured.
+  _renderVirtual(listId, items, keyOf, kindOf, renderItem) {
+    if (items.length <= VIRTUAL_THRESHOLD) return this._keyedRows(listId, items, keyOf, renderItem);
+    const heights = items.map(item => this._rowHeight(kindOf(item)));
+    const scrollTop = this._scrollTops[listId] || 0;
+    const viewport = this._viewports[listId] || VIRTUAL_VIEWPORT;
+
+    let first = 0;
+    let offset = 0;
+    while (first < items.length - 1 && offset + heights[first] <= scrollTop) offset += heights[first++];
+    let last = first;
+    let shown = offset - scrollTop;
+    while (last < items.length && shown < viewport) shown += heights[last++];
+
+    const from = Math.max(0, first - VIRTUAL_OVERSCAN);
+    const to = Math.min(items.length, last + VIRTUAL_OVERSCAN);
+    let before = 0;
+    for (let i = 0; i < from; i++) before += heights[i];
+    let after = 0;
+    for (let i = to; i < items.length; i++) after += heights[i];
+    return html`
+      <div style="height:${before}px"></div>
+      ${this._keyedRows(listId, items.slice(from, to), keyOf, renderItem)}
+      <div style="height:${after}px"></div>
+    `;
+  }
+
   _forceVisibility() {
     this.style.setProperty('display', 'block', 'important');
     this.style.setProperty('visibility', 'visible', 'important');
@@ -1068,17 +1256,19 @@ class CombinedNotificationsPanel extends LitElement {
     if (super.connectedCallback) super.connectedCallback();
     this._injectStyles();
     this._forceVisibility();
+    this._mark("connected");
 
-    requestAnimationFrame(() => {
-      Promise.race([
-        customElements.whenDefined("ha-icon-picker"),
-        new Promise(r => setTimeout(r, 1000))
-      ]).then(() => {
-        this._maybeLoadConfig();
-      });
-    });
+    // Custom elements such as ha-icon-picker upgrade in place once they are
+    // defined, so loading never waits for them.
+    this._maybeLoadConfig();
+
+    // Re-attached after navigating away: resume the state stream
+    if (this._config && !this._statesUnsub) this._loadStates();
+  }
 
-    console.log('%cCN Panel: deferred init via requestAnimationFrame', 'color:#63b3ed');
+  disconnectedCallback() {
+    if (super.disconnectedCallback) super.disconnectedCallback();
+    this._unsubscribeStates();
   }
 
   _maybeLoadConfig() {
@@ -1092,22 +1282,65 @@ class CombinedNotificationsPanel extends LitElement {
     return this.panel?.config?._panel_custom?.config?.entry_id || "";
   }
 
+  // Performance marks for measuring time-to-interactive: cn-connected,
+  // cn-bootstrap-sent, cn-bootstrap-received and cn-interactive, plus the
+  // cn-time-to-interactive measure between the first and the last.
+  _mark(name) {
+    if (typeof performance === "undefined" || !performance.mark) return;
+    performance.mark(`cn-${name}`);
+  }
+
+  _measureInteractive() {
+    if (this._interactiveMeasured || typeof performance === "undefined" || !performance.measure) return;
+    this._interactiveMeasured = true;
+    this._mark("interactive");
+    try {
+      performance.measure("cn-time-to-interactive", "cn-connected", "cn-interactive");
+      const [measure] = performance.getEntriesByName("cn-time-to-interactive").slice(-1);
+      console.log('%cCN Panel: interactive after %s ms', 'color:#39FF14', Math.round(measure.duration));
+    } catch (e) {
+      // A mark is missing (e.g. cleared by the page); nothing to report
+    }
+  }
+
   async _loadConfig() {
     try {
-      console.log('%cCN Panel: Sending get_config WS call', 'color:#63b3ed', this._entryId);
+      console.log('%cCN Panel: Sending bootstrap WS call', 'color:#63b3ed', this._entryId);
+      this._mark("bootstrap-sent");
+      // One round trip: the first event carries the config, the presorted
+      // entity rows and the smart group previews; state deltas follow on the
+      // same subscription.
       const result = await Promise.race([
-        this.hass.callWS({
-          type: "combined_notifications/get_config",
-          entry_id: this._entryId,
+        new Promise((resolve, reject) => {
+          this.hass.connection.subscribeMessage(
+            msg => {
+              if (!msg.config) {
+                this._applyStates(msg);
+                return;
+              }
+              this._applyStates({ rows: msg.rows });
+              // Resubscribed after a reconnect: keep the config being edited
+              if (this._config) this._schedulePreviews(true);
+              resolve(msg);
+            },
+            {
+              type: "combined_notifications/bootstrap",
+              entry_id: this._entryId,
+              attributes: STATE_ATTRIBUTES,
+            },
+          ).then(unsub => {
+            this._statesUnsub = unsub;
+            if (!this.isConnected) this._unsubscribeStates();
+          }, reject);
         }),
         new Promise((_, reject) => setTimeout(() => reject(new Error("WebSocket timeout after 8s")), 8000))
       ]);
+      this._mark("bootstrap-received");
       console.log('%cCN Panel: Config loaded successfully', 'color:#39FF14');
 
       this._config = { ...result.config };
       this._options = { ...(result.options || {}) };
       this._originalName = result.config.name || ""
-      this._states = result.states || {};
 
       if (!this._config.conditions) this._config.conditions = [];
       this._totalPaused = this._config.conditions.filter(c => c.paused).length;
@@ -1121,7 +1354,10 @@ class CombinedNotificationsPanel extends LitElement {
         })),
       }));
 
-      this._loadStates();
+      this._groupPreviews = result.groups || [];
+      this._previewKey = this._previewRequest().key;
+      this._savedConditions = result.config.conditions || [];
+      this._savedSettings = this._settingsJson();
 
     } catch (e) {
       console.log("CN Panel: error:", e);
@@ -1131,35 +1367,144 @@ class CombinedNotificationsPanel extends LitElement {
   }
 
   async _loadStates() {
-    await new Promise(r => setTimeout(r, 50));
+    if (this._statesUnsub) return;
+    try {
+      // A snapshot first, then only batched deltas — the editor stays live
+      // without downloading every state again.
+      this._statesUnsub = await this.hass.connection.subscribeMessage(
+        msg => this._applyStates(msg),
+        {
+          type: "combined_notifications/subscribe_states",
+          entry_id: this._entryId,
+          fields: STATE_FIELDS,
+          attributes: STATE_ATTRIBUTES,
+        },
+      );
+      if (!this.isConnected) this._unsubscribeStates();
+    } catch (e) {
+      console.log("CN Panel: error loading states:", e);
+      this._states = {};
+      this._allEntityList = [];
+      this.requestUpdate();
+    }
+  }
+
+  async _searchEntities(pickerId, query) {
+    if (!query) {
+      this._searchResults = { ...this._searchResults, [pickerId]: { query, results: [] } };
+      return;
+    }
     try {
       const result = await this.hass.callWS({
-        type: "combined_notifications/get_states",
+        type: "combined_notifications/search_entities",
         entry_id: this._entryId,
+        query,
+        limit: 50,
       });
+      // Drop answers to queries the user has already typed past
+      if (this._entitySearch[pickerId] !== query) return;
+      this._searchResults = { ...this._searchResults, [pickerId]: result };
+      this.requestUpdate();
+    } catch (e) {
+      console.log("CN Panel: entity search failed:", e);
+    }
+  }
 
-      this._states = result.states || {};
-
-      this._allEntityList = Object.entries(this._states)
-        .map(([id, s]) => {
-          const normalized = {
-            ...s,
-            friendly_name: s.friendly_name || s.attributes?.friendly_name || id,
-            state: s.state || s.attributes?.state || "",
-          };
-          return [id, normalized];
-        })
-        .sort((a, b) => {
-          const da = a[0].split(".")[0];
-          const db = b[0].split(".")[0];
-          return da !== db ? da.localeCompare(db) : a[0].localeCompare(b[0]);
-        });
+  // Members and counts of every smart group come from the backend, which
+  // matches entities exactly like the sensor does; the panel never rescans
+  // the entity list. Only a change to a keyword or exclusion list refetches.
+  _previewRequest() {
+    const groups = (this._config?.conditions || []).map(c => "entity_filter" in c
+      ? { entity_filter: c.entity_filter || "", entity_filter_exclude: c.entity_filter_exclude || [] }
+      : null);
+    return { groups, key: JSON.stringify(groups) };
+  }
 
+  _schedulePreviews(force = false) {
+    const { groups, key } = this._previewRequest();
+    if (!force && key === this._previewKey) return;
+    this._previewKey = key;
+    clearTimeout(this._previewTimer);
+    this._previewTimer = setTimeout(() => this._loadPreviews(groups), 120);
+  }
+
+  async _loadPreviews(groups) {
+    const seq = ++this._previewSeq;
+    const wanted = groups.filter(Boolean);
+    try {
+      const result = wanted.length === 0 ? { groups: [] } : await this.hass.callWS({
+        type: "combined_notifications/preview_smart_groups",
+        entry_id: this._entryId,
+        groups: wanted,
+      });
+      // A newer request is on its way
+      if (seq !== this._previewSeq) return;
+      let next = 0;
+      this._groupPreviews = groups.map(g => g ? result.groups[next++] : null);
+      this.requestUpdate();
     } catch (e) {
-      console.log("CN Panel: error loading states:", e);
-      this._states = {};
-      this._allEntityList = [];
+      console.log("CN Panel: smart group preview failed:", e);
     }
+  }
+
+  _previewFor(index) {
+    return this._groupPreviews[index] || EMPTY_PREVIEW;
+  }
+
+  _unsubscribeStates() {
+    if (this._statesUnsub) {
+      this._statesUnsub();
+      this._statesUnsub = null;
+    }
+  }
+
+  _applyStates(msg) {
+    const normalize = (id, s) => ({
+      ...s,
+      friendly_name: s.friendly_name || s.attributes?.friendly_name || id,
+      state: s.state || s.attributes?.state || "",
+    });
+
+    if (msg.rows) {
+      // Compact rows from bootstrap, already sorted by entity_id
+      const states = {};
+      const list = [];
+      for (const [id, state, friendly_name, attributes] of msg.rows) {
+        states[id] = normalize(id, { state, friendly_name, attributes });
+        list.push([id, states[id]]);
+      }
+      this._states = states;
+      this._allEntityList = list;
+      this.requestUpdate();
+      return;
+    }
+
+    let states;
+    // Smart group members depend on entity ids and friendly names only
+    let membersChanged = !!(msg.snapshot || msg.added || msg.removed);
+    if (msg.snapshot) {
+      states = {};
+      for (const [id, s] of Object.entries(msg.snapshot)) states[id] = normalize(id, s);
+    } else {
+      states = { ...this._states };
+      for (const [id, s] of Object.entries(msg.changed || {})) {
+        states[id] = normalize(id, s);
+        if (states[id].friendly_name !== this._states[id]?.friendly_name) membersChanged = true;
+      }
+      for (const [id, s] of Object.entries(msg.added || {})) states[id] = normalize(id, s);
+      for (const id of msg.removed || []) delete states[id];
+    }
+    this._states = states;
+
+    if (msg.snapshot || msg.added || msg.removed) {
+      // Same order as the bootstrap rows: by entity_id, so domain first
+      this._allEntityList = Object.entries(states)
+        .sort((a, b) => (a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0));
+    } else {
+      // Only rows changed: keep the sorted order
+      this._allEntityList = this._allEntityList.map(([id]) => [id, states[id]]);
+    }
+    if (membersChanged) this._schedulePreviews(true);
     this.requestUpdate();
   }
 
@@ -1176,11 +1521,28 @@ class CombinedNotificationsPanel extends LitElement {
           operator: OPERATOR_LABEL_TO_SYMBOL[ac.operator] || ac.operator,
         })),
       }));
-      await this.hass.callWS({
-        type: "combined_notifications/save_config",
-        entry_id: this._entryId,
-        data: { ...this._config, conditions },
-      });
+      const patches = this._settingsJson() === this._savedSettings
+        ? this._conditionPatches(conditions)
+        : null;
+      if (patches) {
+        for (const { index, ...patch } of patches) {
+          const result = await this.hass.callWS({ ...patch, entry_id: this._entryId });
+          if (index !== undefined) conditions[index] = result.condition;
+        }
+      } else {
+        const result = await this.hass.callWS({
+          type: "combined_notifications/save_config",
+          entry_id: this._entryId,
+          data: { ...this._config, conditions },
+        });
+        conditions.splice(0, conditions.length, ...result.conditions);
+        this._savedSettings = this._settingsJson();
+      }
+      this._savedConditions = conditions;
+      // Adopt the ids of added conditions
+      if (this._config.conditions.length === conditions.length) {
+        this._config.conditions = this._config.conditions.map((c, i) => ({ ...c, id: conditions[i].id }));
+      }
       this._saved = true;
     } catch (e) {
       this._error = `Failed to save: ${e.message}`;
@@ -1189,6 +1551,42 @@ class CombinedNotificationsPanel extends LitElement {
     this.requestUpdate();
   }
 
+  _settingsJson() {
+    const { conditions, ...settings } = this._config;
+    return stableJson(settings);
+  }
+
+  // The condition commands that turn the last saved conditions into
+  // conditions, one changed condition each, or null when only a full save
+  // can (kept conditions reordered, or added ones not at the end).
+  _conditionPatches(conditions) {
+    const saved = new Map(this._savedConditions.map(c => [c.id, c]));
+    const ids = new Set(conditions.map(c => c.id));
+    const patches = this._savedConditions
+      .filter(c => !ids.has(c.id))
+      .map(c => ({ type: "combined_notifications/remove_condition", condition_id: c.id }));
+    const kept = this._savedConditions.filter(c => ids.has(c.id));
+    let position = 0;
+    let added = false;
+    for (const [index, condition] of conditions.entries()) {
+      const before = saved.get(condition.id);
+      if (!before) {
+        const { id, ...fields } = condition;
+        patches.push({ type: "combined_notifications/add_condition", condition: fields, index });
+        added = true;
+        continue;
+      }
+      if (added || kept[position++] !== before) return null;
+      if (stableJson(condition) === stableJson(before)) continue;
+      const { paused, ...rest } = condition;
+      const { paused: wasPaused, ...restBefore } = before;
+      patches.push(stableJson(rest) === stableJson(restBefore)
+        ? { type: "combined_notifications/set_paused", condition_id: condition.id, paused: !!paused }
+        : { type: "combined_notifications/update_condition", condition_id: condition.id, condition, index });
+    }
+    return patches;
+  }
+
   _set(key, value) {
     this._config = { ...this._config, [key]: value };
     this.requestUpdate();
@@ -1205,7 +1603,7 @@ class CombinedNotificationsPanel extends LitElement {
       // Start every matched entity OFF (excluded). The user turns ON only what
       // they want monitored. This guarantees nothing can alert from a newly
       // created group until the user opts it in — no surprise counts.
-      const allMatched = this._matchedEntities(conditions[index]);
+      const allMatched = this._scanEntities(conditions[index]);
       conditions[index].entity_filter_exclude = allMatched.map(([id]) => id);
       conditions[index].entity_filter_initialized = true;
     }
@@ -1261,6 +1659,8 @@ class CombinedNotificationsPanel extends LitElement {
     this._config = { ...this._config, conditions };
     const expanded = new Set([...this._expandedConditions].filter(i => i !== index).map(i => i > index ? i - 1 : i));
     this._expandedConditions = expanded;
+    // Keep the previews aligned until the refetch answers
+    this._groupPreviews = this._groupPreviews.filter((_, i) => i !== index);
     this.requestUpdate();
   }
 
@@ -1334,12 +1734,9 @@ class CombinedNotificationsPanel extends LitElement {
     const typedId = (searchVal || "").trim().toLowerCase();
     const isValidEntityShape = /^[a-z0-9_]+\.[a-z0-9_]+$/.test(typedId);
 
+    // Ranked matches come from the backend search index
     const filtered = isSearching && searchVal.length > 0
-      ? this._allEntityList.filter(([id, s]) => {
-          const fn = (s.friendly_name || "").toLowerCase();
-          const q = searchVal.toLowerCase();
-          return id.toLowerCase().includes(q) || fn.includes(q);
-        }).slice(0, 50)
+      ? (this._searchResults[pickerId]?.results || []).map(r => [r.entity_id, r])
       : [];
 
     let displayName = "";
@@ -1358,6 +1755,7 @@ class CombinedNotificationsPanel extends LitElement {
             .value="${isSearching ? searchVal : displayName}"
             @focus="${() => {
               this._entitySearch = { ...this._entitySearch, [pickerId]: currentEntityId || "" };
+              this._searchEntities(pickerId, currentEntityId || "");
               this.requestUpdate();
             }}"
             @input="${e => {
@@ -1365,6 +1763,7 @@ class CombinedNotificationsPanel extends LitElement {
               if (this._debounceTimer) clearTimeout(this._debounceTimer);
               this._debounceTimer = setTimeout(() => {
                 this._entitySearch = { ...this._entitySearch, [pickerId]: val };
+                this._searchEntities(pickerId, val);
                 this.requestUpdate();
               }, 180);
             }}"
@@ -1446,20 +1845,15 @@ class CombinedNotificationsPanel extends LitElement {
     return (DOMAIN_GROUPS[groupName] || []).includes(domain);
   }
 
-  _getMatchedGroups(condition) {
-    if (!condition?.entity_filter) return [];
-    const matchedDomains = new Set(this._getMatchedDomains(condition));
-    if (matchedDomains.size === 0) return [];
-    return Object.keys(DOMAIN_GROUPS).filter(groupName => {
-      return [...matchedDomains].some(domain => this._domainInGroup(domain, groupName));
-    });
+  // Domain groups with at least one member, in DOMAIN_GROUPS order
+  _getMatchedGroups(index) {
+    return Object.keys(this._previewFor(index).domain_groups);
   }
 
   // Entity_ids of the currently-matched entities that belong to this group.
-  _groupEntityIds(condition, groupName) {
-    return this._matchedEntities(condition)
-      .filter(([id]) => this._domainInGroup(id.split(".")[0], groupName))
-      .map(([id]) => id);
+  _groupEntityIds(index, groupName) {
+    return this._previewFor(index).members
+      .filter(id => this._domainInGroup(id.split(".")[0], groupName));
   }
 
   // Tapping a chip filters the VISIBLE list to that group only (view filter).
@@ -1509,16 +1903,19 @@ class CombinedNotificationsPanel extends LitElement {
            this._smartGroups.filter(c => !c.paused).length;
   }
 
-  get _totalEntities() {
-    let total = this._individualConditions.filter(c => !c.paused).length;
-    for (const sg of this._smartGroups) {
-      if (sg.paused) continue;
-      const excluded = new Set(sg.entity_filter_exclude || []);
-      total += this._matchedEntities(sg).filter(([id]) => !excluded.has(id)).length;
-    }
+  // Included smart group members, from the backend previews
+  _smartGroupIncluded(withPaused) {
+    let total = 0;
+    (this._config?.conditions || []).forEach((c, i) => {
+      if ("entity_filter" in c && (withPaused || !c.paused)) total += this._previewFor(i).included;
+    });
     return total;
   }
 
+  get _totalEntities() {
+    return this._individualConditions.filter(c => !c.paused).length + this._smartGroupIncluded(false);
+  }
+
   get _individualCount() {
     return this._individualConditions.filter(c => !c.paused).length;
   }
@@ -1532,13 +1929,7 @@ class CombinedNotificationsPanel extends LitElement {
   }
 
   get _smartGroupEntityCount() {
-    let total = 0;
-    for (const sg of this._smartGroups) {
-      if (sg.paused) continue;
-      const excluded = new Set(sg.entity_filter_exclude || []);
-      total += this._matchedEntities(sg).filter(([id]) => !excluded.has(id)).length;
-    }
-    return total;
+    return this._smartGroupIncluded(false);
   }
 
   get _smartGroupPausedCount() {
@@ -1546,12 +1937,7 @@ class CombinedNotificationsPanel extends LitElement {
   }
 
   get _overviewEntityCount() {
-    let total = this._individualConditions.length;
-    for (const sg of this._smartGroups) {
-      const excluded = new Set(sg.entity_filter_exclude || []);
-      total += this._matchedEntities(sg).filter(([id]) => !excluded.has(id)).length;
-    }
-    return total;
+    return this._individualConditions.length + this._smartGroupIncluded(true);
   }
 
   _buildOverviewRows() {
@@ -1576,6 +1962,7 @@ class CombinedNotificationsPanel extends LitElement {
         return true;
       })();
       rows.push({
+        key: `${idx}:${cond.entity_id}`,
         name: cond.name || friendly,
         entityId: cond.entity_id,
         domain: cond.entity_id.split(".")[0],
@@ -1592,7 +1979,7 @@ class CombinedNotificationsPanel extends LitElement {
     for (const [idx, cond] of conditions.entries()) {
       if (!("entity_filter" in cond)) continue;
       const excluded = new Set(cond.entity_filter_exclude || []);
-      const matched = this._matchedEntities(cond);
+      const matched = this._matchedEntities(idx);
       const groupLabel = cond.entity_filter_name || (cond.entity_filter ? `Smart Group: ${cond.entity_filter}` : "Smart Group");
       for (const [entityId, s] of matched) {
         if (excluded.has(entityId)) continue;
@@ -1604,6 +1991,7 @@ class CombinedNotificationsPanel extends LitElement {
           return this._evalCondition(state, cond.operator, cond.trigger_value);
         })();
         rows.push({
+          key: `${idx}:${entityId}`,
           name: displayName,
           entityId,
           domain: entityId.split(".")[0],
@@ -1657,20 +2045,14 @@ class CombinedNotificationsPanel extends LitElement {
     return `${symbol} ${triggerValue}`;
   }
 
-  _getMatchedDomains(condition) {
-    const keyword = (condition.entity_filter || "").toLowerCase();
-    if (!keyword) return [];
-    const domains = new Set();
-    this._allEntityList.forEach(([id, s]) => {
-      const fn = (s.friendly_name || "").toLowerCase();
-      if (id.toLowerCase().includes(keyword) || fn.includes(keyword)) {
-        domains.add(id.split(".")[0]);
-      }
-    });
-    return [...domains].sort();
+  // [entity_id, state] of every member of the smart group at index
+  _matchedEntities(index) {
+    return this._previewFor(index).members.map(id => [id, this._states[id] || { friendly_name: id, state: "" }]);
   }
 
-  _matchedEntities(condition) {
+  // Local scan, only used to start a brand-new group with all of its first
+  // matches excluded, before any preview exists.
+  _scanEntities(condition) {
     const keyword = (condition.entity_filter || "").toLowerCase();
     if (!keyword) return [];
     return this._allEntityList.filter(([entityId, state]) => {
@@ -2186,10 +2568,10 @@ class CombinedNotificationsPanel extends LitElement {
   _renderSmartGroupCard(condition, index) {
     const isOpen = this._expandedConditions.has(index);
     const isPaused = condition.paused || false;
-    const allMatched = this._matchedEntities(condition);
+    const allMatched = this._matchedEntities(index);
     const visibleList = this._applyGroupViewFilter(index, allMatched);
     const excluded = new Set(condition.entity_filter_exclude || []);
-    const activeCount = allMatched.filter(([id]) => !excluded.has(id)).length;
+    const activeCount = this._previewFor(index).included;
     const sub = condition.entity_filter
       ? `${activeCount} / ${allMatched.length} found · ${condition.operator || "equals"} ${condition.trigger_value || ""}`
       : "Not configured yet";
@@ -2241,7 +2623,7 @@ class CombinedNotificationsPanel extends LitElement {
               <div class="domain-filter">
                 <div class="domain-filter-label">Show only:</div>
                 <div class="domain-chips">
-                  ${this._getMatchedGroups(condition).map(groupName => {
+                  ${this._getMatchedGroups(index).map(groupName => {
                     const isActive = this._groupViewFilter[index] === groupName;
                     const chipClass = isActive ? "included" : "excluded";
                     return html`
@@ -2276,33 +2658,42 @@ class CombinedNotificationsPanel extends LitElement {
                     <button class="list-action-btn exclude-all-btn" @click="${() => this._excludeFromList(index, visibleList)}">Exclude All</button>
                   </div>
                 </div>
-                ${visibleList.map(([entityId, state]) => {
-                  const overrides = condition.entity_label_overrides || {};
-                  const customLabel = overrides[entityId] || "";
-                  return html`
-                    <div class="entity-item ${excluded.has(entityId) ? "excluded" : ""}">
-                      <div class="entity-info">
-                        <div class="entity-name">${state.friendly_name || entityId}</div>
-                        <div class="entity-id">${entityId}</div>
-                        ${!excluded.has(entityId) ? html`
-                          <input
-                            type="text"
-                            class="entity-label-input"
-                            placeholder="Custom alert label (optional)"
-                            .value="${customLabel}"
-                            @input="${e => this._setEntityLabel(index, entityId, e.target.value)}"
-                            @click="${e => e.stopPropagation()}"
-                          >
-                        ` : ""}
-                      </div>
-                      <div class="entity-right">
-                        <span class="state-val">${state.state}</span>
-                        <div class="mini-toggle ${excluded.has(entityId) ? "off" : ""}"
-                          @click="${() => this._toggleEntityExclude(index, entityId)}"></div>
+                <div class="entity-list-rows" @scroll="${e => this._onVirtualScroll(`members-${index}`, e)}">
+                ${this._renderVirtual(
+                  `members-${index}`,
+                  visibleList,
+                  ([entityId]) => entityId,
+                  ([entityId]) => (excluded.has(entityId) ? "member-excluded" : "member"),
+                  ([entityId, state]) => {
+                    const overrides = condition.entity_label_overrides || {};
+                    const customLabel = overrides[entityId] || "";
+                    return html`
+                      <div class="entity-item ${excluded.has(entityId) ? "excluded" : ""}"
+                        data-vkind="${excluded.has(entityId) ? "member-excluded" : "member"}">
+                        <div class="entity-info">
+                          <div class="entity-name">${state.friendly_name || entityId}</div>
+                          <div class="entity-id">${entityId}</div>
+                          ${!excluded.has(entityId) ? html`
+                            <input
+                              type="text"
+                              class="entity-label-input"
+                              placeholder="Custom alert label (optional)"
+                              .value="${customLabel}"
+                              @input="${e => this._setEntityLabel(index, entityId, e.target.value)}"
+                              @click="${e => e.stopPropagation()}"
+                            >
+                          ` : ""}
+                        </div>
+                        <div class="entity-right">
+                          <span class="state-val">${state.state}</span>
+                          <div class="mini-toggle ${excluded.has(entityId) ? "off" : ""}"
+                            @click="${() => this._toggleEntityExclude(index, entityId)}"></div>
+                        </div>
                       </div>
-                    </div>
-                  `;
-                })}
+                    `;
+                  },
+                )}
+                </div>
               </div>
             ` : ""}
 
@@ -2339,6 +2730,12 @@ class CombinedNotificationsPanel extends LitElement {
       domainMap.get(row.domain).push(row);
     }
     const domains = [...domainMap.keys()].sort();
+    // One flat list of domain dividers and rows, so it can be windowed
+    const items = [];
+    for (const domain of domains) {
+      items.push({ divider: domain });
+      for (const row of domainMap.get(domain)) items.push({ row });
+    }
 
     return html`
       <div class="overview-key">
@@ -2351,28 +2748,33 @@ class CombinedNotificationsPanel extends LitElement {
         <div class="empty-hint" style="padding:12px 4px;font-style:italic">No monitored entities yet. Add conditions in the Individual or Groups tabs.</div>
       ` : html`
         <div class="overview-scroll-wrap">
-          <div class="overview-container">
+          <div class="overview-container" @scroll="${e => this._onVirtualScroll("overview", e)}">
             <div class="overview-thead">
               <span>Entity</span>
               <span>State</span>
               <span>Condition</span>
             </div>
-            ${domains.map(domain => html`
-              <div class="overview-domain-divider">${this._pluralizeDomain(domain)}</div>
-              ${domainMap.get(domain).map(row => html`
-                <div class="overview-row ${row.alert ? "row-alert" : row.paused ? "row-paused" : "row-ok"}">
+            ${this._renderVirtual(
+              "overview",
+              items,
+              item => (item.divider ? `divider:${item.divider}` : item.row.key),
+              item => (item.divider ? "overview-divider" : "overview-row"),
+              item => item.divider ? html`
+                <div class="overview-domain-divider" data-vkind="overview-divider">${this._pluralizeDomain(item.divider)}</div>
+              ` : html`
+                <div class="overview-row ${item.row.alert ? "row-alert" : item.row.paused ? "row-paused" : "row-ok"}" data-vkind="overview-row">
                   <div class="overview-entity-cell">
-                    <span class="overview-entity-name">${row.name}</span>
+                    <span class="overview-entity-name">${item.row.name}</span>
                     <span class="overview-source-pill">
-                      <span class="overview-source-type">${row.sourceType} —</span>
-                      <span class="overview-source-name">${row.sourceLabel}</span>
+                      <span class="overview-source-type">${item.row.sourceType} —</span>
+                      <span class="overview-source-name">${item.row.sourceLabel}</span>
                     </span>
                   </div>
-                  <span class="overview-state">${row.state}</span>
-                  <span class="overview-condition">${this._formatCondition(row.operator, row.triggerValue)}</span>
+                  <span class="overview-state">${item.row.state}</span>
+                  <span class="overview-condition">${this._formatCondition(item.row.operator, item.row.triggerValue)}</span>
                 </div>
-              `)}
-            `)}
+              `,
+            )}
           </div>
         </div>
       `}
@@ -0,0 +1,204 @@
+"""Entity state payloads for the Combined Notifications panel."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+
+from .const import (
+    RELEVANT_DOMAINS,
+    STATE_FIELDS,
+    STATE_STREAM_MAX_LATENCY,
+    STATE_STREAM_QUIET,
+)
+from .scheduler import CoalescingScheduler
+
+
+def project_state(
+    state: State,
+    fields: Iterable[str] = STATE_FIELDS,
+    attributes: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Return the panel row of one state with only the requested fields.
+    attributes limits the attribute keys sent; None sends them all.
+    """
+    row: dict[str, Any] = {}
+    for field in fields:
+        if field == "state":
+            row["state"] = state.state
+        elif field == "friendly_name":
+            row["friendly_name"] = state.attributes.get("friendly_name", state.entity_id)
+        elif field == "attributes":
+            if attributes is None:
+                row["attributes"] = dict(state.attributes)
+            else:
+                row["attributes"] = {
+                    key: state.attributes[key]
+                    for key in attributes
+                    if key in state.attributes
+                }
+    return row
+
+
+def build_states_payload(
+    hass: HomeAssistant,
+    fields: Iterable[str] | None = None,
+    attributes: Iterable[str] | None = None,
+    domains: Iterable[str] | None = None,
+    prefix: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> dict[str, Any]:
+    """
+    Build the get_states payload for entities in RELEVANT_DOMAINS.
+
+    Without options this is every field and attribute of every entity, as
+    the panel has always received. fields and attributes project each row,
+    domains and prefix filter the entities, and offset/limit page through
+    them in entity_id order. total is the number of matching entities and
+    next_offset is None on the last page.
+    """
+    fields = tuple(fields) if fields is not None else STATE_FIELDS
+    if attributes is not None:
+        attributes = tuple(attributes)
+    wanted = RELEVANT_DOMAINS if domains is None else RELEVANT_DOMAINS.intersection(domains)
+
+    matching = [
+        state
+        for state in hass.states.async_all()
+        if state.domain in wanted and (not prefix or state.entity_id.startswith(prefix))
+    ]
+    total = len(matching)
+    if offset or limit is not None:
+        matching.sort(key=lambda state: state.entity_id)
+        end = total if limit is None else offset + limit
+        matching = matching[offset:end]
+        next_offset = end if end < total else None
+    else:
+        next_offset = None
+
+    return {
+        "states": {
+            state.entity_id: project_state(state, fields, attributes)
+            for state in matching
+        },
+        "total": total,
+        "offset": offset,
+        "next_offset": next_offset,
+    }
+
+
+def compact_rows(rows: dict[str, dict[str, Any]]) -> list[list[Any]]:
+    """
+    Return rows as [entity_id, state, friendly_name, attributes] lists,
+    sorted by entity_id (domain first), ready to show without sorting.
+    """
+    return [
+        [entity_id, row.get("state"), row.get("friendly_name"), row.get("attributes")]
+        for entity_id, row in sorted(rows.items())
+    ]
+
+
+class StateStream:
+    """
+    Live projected entity rows for one subscribe_states subscription.
+
+    The subscriber gets one snapshot and then batches of deltas: rows that
+    changed, rows that were added and entity_ids that were removed. Only
+    entities whose projected row actually differs from what was last sent
+    are included, so attribute churn outside the projection sends nothing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[dict[str, Any]], None],
+        fields: Iterable[str] | None = None,
+        attributes: Iterable[str] | None = None,
+    ) -> None:
+        """Initialize the stream. send receives each delta message."""
+        self._hass = hass
+        self._send = send
+        self._fields = tuple(fields) if fields is not None else STATE_FIELDS
+        self._attributes = tuple(attributes) if attributes is not None else None
+        # entity_id -> row as the subscriber currently has it
+        self._sent: dict[str, dict[str, Any]] = {}
+        # entity_id -> current row, None once removed, until the next flush
+        self._dirty: dict[str, dict[str, Any] | None] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self._scheduler = CoalescingScheduler(
+            hass, self._async_flush, STATE_STREAM_QUIET, STATE_STREAM_MAX_LATENCY
+        )
+
+    @callback
+    def async_start(self) -> dict[str, dict[str, Any]]:
+        """Start listening and return the snapshot of every relevant entity."""
+        self._sent = {
+            state.entity_id: project_state(state, self._fields, self._attributes)
+            for state in self._hass.states.async_all()
+            if state.domain in RELEVANT_DOMAINS
+        }
+        self._unsub = self._hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            self._async_state_changed,
+            event_filter=self._async_is_relevant,
+        )
+        return dict(self._sent)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening and drop pending deltas."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._scheduler.async_cancel()
+        self._dirty.clear()
+
+    @staticmethod
+    @callback
+    def _async_is_relevant(event_data) -> bool:
+        return event_data["entity_id"].partition(".")[0] in RELEVANT_DOMAINS
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        new_state = event.data["new_state"]
+        row = (
+            project_state(new_state, self._fields, self._attributes)
+            if new_state is not None
+            else None
+        )
+        entity_id = event.data["entity_id"]
+        if entity_id not in self._dirty and self._sent.get(entity_id) == row:
+            return
+        self._dirty[entity_id] = row
+        self._scheduler.async_trigger()
+
+    async def _async_flush(self) -> None:
+        """Send everything that differs from the subscriber's copy."""
+        changed: dict[str, dict[str, Any]] = {}
+        added: dict[str, dict[str, Any]] = {}
+        removed: list[str] = []
+        dirty, self._dirty = self._dirty, {}
+        for entity_id, row in dirty.items():
+            previous = self._sent.get(entity_id)
+            if row is None:
+                if previous is not None:
+                    del self._sent[entity_id]
+                    removed.append(entity_id)
+            elif previous is None:
+                added[entity_id] = self._sent[entity_id] = row
+            elif previous != row:
+                changed[entity_id] = self._sent[entity_id] = row
+        delta: dict[str, Any] = {}
+        if changed:
+            delta["changed"] = changed
+        if added:
+            delta["added"] = added
+        if removed:
+            delta["removed"] = removed
+        if delta:
+            self._send(delta)
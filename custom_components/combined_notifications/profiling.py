@@ -0,0 +1,257 @@
+"""On-demand profiling of the Combined Notifications evaluation path."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, defaultdict
+from datetime import datetime
+import logging
+import os
+import signal
+import threading
+from types import FrameType
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+PROFILING_KEY = "_profiling"
+
+# Functions listed in the report
+REPORT_CALLS = 40
+
+# Seconds between two samples of the event loop's stack
+SAMPLE_INTERVAL = 0.002
+
+# The service call stays open while it samples, so a profile is kept short
+MAX_DURATION = 300
+
+# The work a sensor marks for the sampler, in report column order; a check
+# is counted under "check" only, not again under the path that ran it
+PATHS = ("check", "state change", "membership", "template")
+
+_PACKAGE_DIR = os.path.dirname(__file__) + os.sep
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): cv.string,
+    vol.Optional("duration", default=60): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=MAX_DURATION)
+    ),
+})
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the admin-only profile service once."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def _async_handle_profile(call: ServiceCall) -> None:
+        await async_profile(hass, call.data["duration"], call.data.get("entry_id"))
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_PROFILE, _async_handle_profile, PROFILE_SCHEMA
+    )
+
+
+async def async_profile(
+    hass: HomeAssistant, duration: float, entry_id: str | None = None
+) -> str:
+    """
+    Sample the event loop for duration seconds and attribute the samples
+    taken while the selected sensors (all when entry_id is None) work to
+    their conditions. Writes a report to the config directory and returns
+    its path.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    sensors = {
+        key: sensor
+        for key, sensor in domain_data.items()
+        if hasattr(sensor, "start_sampling") and entry_id in (None, key)
+    }
+    if entry_id is not None and not sensors:
+        raise HomeAssistantError(f"No Combined Notifications sensor for entry {entry_id}")
+    if domain_data.get(PROFILING_KEY):
+        raise HomeAssistantError("A Combined Notifications profile is already running")
+
+    domain_data[PROFILING_KEY] = True
+    sampler = Sampler(SAMPLE_INTERVAL)
+    for sensor in sensors.values():
+        sensor.start_sampling(sampler)
+    started = datetime.now()
+    _LOGGER.info("Profiling Combined Notifications for %s seconds", duration)
+    try:
+        sampler.start()
+        await asyncio.sleep(duration)
+    finally:
+        sampler.stop()
+        for sensor in sensors.values():
+            sensor.stop_sampling()
+        domain_data[PROFILING_KEY] = False
+
+    sections = [
+        _condition_section(sampler, sensor.entity_id, sensor.condition_names())
+        for sensor in sensors.values()
+    ]
+    path = hass.config.path(
+        f"combined_notifications_profile_{started:%Y%m%d_%H%M%S}.txt"
+    )
+    await hass.async_add_executor_job(
+        _write_report, path, started, duration, sections, sampler
+    )
+    _LOGGER.info("Combined Notifications profile written to %s", path)
+    return path
+
+
+class Sampler:
+    """
+    Sample the event loop's stack on a profiling timer.
+
+    setitimer(ITIMER_PROF) raises SIGPROF every interval of process CPU
+    time, and the handler, which Python runs on the main thread where the
+    event loop lives, reads the frame the loop was interrupted in. A thread
+    reading sys._current_frames() would be biased: it only gets the GIL
+    when the loop blocks in select, so it would mostly see the loop idle.
+    The loop itself runs untraced; all it adds is the marks the profiled
+    sensors set. A sample counts for every integration function on the
+    stack and, while a sensor has marked the path and conditions it works
+    on, for those conditions.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Prepare a sampler; start() must run on the main thread."""
+        self.interval = interval
+        # (sensor entity_id, path, segments) the loop works on, set by the
+        # sensors; None when none is
+        self.current: tuple[str, str, tuple[int, ...]] | None = None
+        self.samples = 0
+        self.integration_samples = 0
+        # (file, line, function) -> samples with it anywhere on the stack
+        self.cumulative: Counter[tuple[str, int, str]] = Counter()
+        # (file, line, function) -> samples with it on top of the stack
+        self.own: Counter[tuple[str, int, str]] = Counter()
+        # (sensor entity_id, segment, path) -> samples; a mark for several
+        # segments is split evenly, -1 is a mark for none
+        self.conditions: defaultdict[tuple[str, int, str], float] = defaultdict(float)
+        self._running = False
+
+    def start(self) -> None:
+        """Install the SIGPROF handler and start the timer."""
+        if threading.current_thread() is not threading.main_thread():
+            raise HomeAssistantError("Profiling needs the event loop on the main thread")
+        previous = signal.signal(signal.SIGPROF, self._on_signal)
+        if previous not in (signal.SIG_DFL, signal.SIG_IGN, None):
+            signal.signal(signal.SIGPROF, previous)
+            raise HomeAssistantError("Another profiler is sampling with SIGPROF")
+        # Restart system calls the signal interrupts in other threads
+        signal.siginterrupt(signal.SIGPROF, False)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self._running = True
+
+    def stop(self) -> None:
+        """Stop the timer and remove the handler, if start() installed them."""
+        if not self._running:
+            return
+        self._running = False
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def _on_signal(self, signum: int, frame: FrameType | None) -> None:
+        self._sample(frame)
+
+    def _sample(self, frame: FrameType | None) -> None:
+        mark = self.current
+        self.samples += 1
+
+        on_stack: set[tuple[str, int, str]] = set()
+        top = True
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename.startswith(_PACKAGE_DIR):
+                key = (os.path.basename(code.co_filename), code.co_firstlineno, code.co_name)
+                on_stack.add(key)
+                if top:
+                    self.own[key] += 1
+            top = False
+            frame = frame.f_back
+        if on_stack:
+            self.integration_samples += 1
+            self.cumulative.update(on_stack)
+
+        if mark is not None:
+            owner, path, segments = mark
+            if segments:
+                share = 1 / len(segments)
+                for segment in segments:
+                    self.conditions[(owner, segment, path)] += share
+            else:
+                self.conditions[(owner, -1, path)] += 1
+
+
+def _condition_section(sampler: Sampler, entity_id: str, names: list[str]) -> str:
+    """Format the per-condition cost of one sensor, most expensive first."""
+    rows: dict[int, dict[str, float]] = defaultdict(dict)
+    for (owner, segment, path), samples in sampler.conditions.items():
+        if owner == entity_id:
+            rows[segment][path] = samples
+
+    ms = sampler.interval * 1000
+    lines = [
+        f"== {entity_id} ==",
+        "".join(f"{path:>14}" for path in (*PATHS, "total")) + "  condition (CPU ms)",
+    ]
+    totals = dict.fromkeys(PATHS, 0.0)
+    for segment, paths in sorted(rows.items(), key=lambda item: -sum(item[1].values())):
+        if segment == -1:
+            name = "(no single condition)"
+        elif segment < len(names):
+            name = names[segment]
+        else:
+            name = "(removed condition)"
+        cells = [paths.get(path, 0.0) * ms for path in PATHS]
+        lines.append("".join(f"{cell:>14.1f}" for cell in (*cells, sum(cells))) + f"  {name}")
+        for path in PATHS:
+            totals[path] += paths.get(path, 0.0)
+    cells = [totals[path] * ms for path in PATHS]
+    lines.append("".join(f"{cell:>14.1f}" for cell in (*cells, sum(cells))) + "  total")
+    return "\n".join(lines)
+
+
+def _write_report(
+    path: str,
+    started: datetime,
+    duration: float,
+    sections: list[str],
+    sampler: Sampler,
+) -> None:
+    """Write the profile report. Runs in the executor."""
+    ms = sampler.interval * 1000
+    with open(path, "w", encoding="utf-8") as report:
+        report.write(
+            f"Combined Notifications profile, {duration:g} s from {started:%Y-%m-%d %H:%M:%S}\n"
+            f"The event loop was sampled every {ms:g} ms of CPU time: {sampler.samples} samples, "
+            f"{sampler.integration_samples} in this integration. Times are samples "
+            f"x {ms:g} ms, so conditions below a few samples are noise.\n\n"
+        )
+        report.write(
+            "Cost per condition and path (a callback for several conditions is "
+            "split between them)\n\n"
+        )
+        for section in sections:
+            report.write(section + "\n\n")
+        report.write("Integration functions by samples on the stack\n")
+        report.write(f"{'stack ms':>10} {'own ms':>10}  function\n")
+        for key, samples in sampler.cumulative.most_common(REPORT_CALLS):
+            filename, line, function = key
+            report.write(
+                f"{samples * ms:>10.1f} {sampler.own[key] * ms:>10.1f}  "
+                f"{function} ({filename}:{line})\n"
+            )
@@ -0,0 +1,77 @@
+"""Coalescing update scheduler for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+
+class CoalescingScheduler:
+    """
+    Run an async action once per burst of triggers.
+
+    The action fires when no trigger has arrived for the quiet window, but
+    never later than max_latency after the first trigger of the burst, so a
+    sensor that never stops changing still gets evaluated regularly.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        action: Callable[[], Coroutine[Any, Any, None]],
+        quiet: float,
+        max_latency: float,
+    ) -> None:
+        """Initialize the scheduler. Times are in seconds."""
+        self._hass = hass
+        self._action = action
+        self._quiet = max(quiet, 0.0)
+        self._max_latency = max(max_latency, self._quiet)
+        self._first_trigger: float | None = None
+        self._last_trigger = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_trigger(self) -> None:
+        """Record a trigger and make sure the action is scheduled."""
+        now = self._hass.loop.time()
+        self._last_trigger = now
+        if self._first_trigger is None:
+            self._first_trigger = now
+        # The pending timer re-arms itself while the burst continues, so a
+        # trigger never has to cancel and recreate it.
+        if self._handle is None:
+            self._handle = self._hass.loop.call_at(self._deadline(), self._fire)
+
+    def _deadline(self) -> float:
+        """Return when the current burst should be flushed."""
+        return min(
+            self._last_trigger + self._quiet,
+            self._first_trigger + self._max_latency,
+        )
+
+    @callback
+    def _fire(self) -> None:
+        """Run the action, or wait longer if the burst is still going."""
+        deadline = self._deadline()
+        if self._hass.loop.time() < deadline:
+            self._handle = self._hass.loop.call_at(deadline, self._fire)
+            return
+        self._handle = None
+        self._first_trigger = None
+        self._task = self._hass.async_create_task(self._action())
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop any scheduled or running action."""
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._first_trigger = None
@@ -0,0 +1,218 @@
+"""Indexed entity search for the Combined Notifications condition editor."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from bisect import bisect_left
+import heapq
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant, State, callback
+
+from .const import DOMAIN, RELEVANT_DOMAINS
+from .hub import async_get_hub
+
+SEARCH_KEY = "_search"
+
+# Any run of non-word characters; letters of every script stay in tokens
+_TOKEN_SPLIT = re.compile(r"[\W_]+")
+
+# How a query token matched an entity token, best first
+_EXACT, _PREFIX, _INFIX = 3, 2, 1
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into casefolded word tokens."""
+    return [token for token in _TOKEN_SPLIT.split(text.casefold()) if token]
+
+
+@callback
+def async_get_search_index(hass: HomeAssistant) -> EntitySearchIndex:
+    """Return the domain-wide search index, building it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    index = domain_data.get(SEARCH_KEY)
+    if index is None:
+        index = domain_data[SEARCH_KEY] = EntitySearchIndex(hass)
+        index.async_start()
+    return index
+
+
+@callback
+def async_stop_search_index(hass: HomeAssistant) -> None:
+    """Stop and drop the search index; the next search builds it again."""
+    index = hass.data.get(DOMAIN, {}).pop(SEARCH_KEY, None)
+    if index is not None:
+        index.async_stop()
+
+
+class EntitySearchIndex:
+    """
+    Token index over the entity_id and friendly_name of every relevant entity.
+
+    Built once from hass.states, then kept current through the hub's entity
+    lifecycle events (created, removed, renamed). A query is split into
+    tokens that must all match a token of the entity — exactly, as a prefix
+    or inside it — so "kit temp" finds "sensor.kitchen_temperature". Only the
+    token vocabulary is scanned, never the entity list, except for a query
+    with no word characters, which is matched as a substring of every name.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index."""
+        self._hass = hass
+        # entity_id -> friendly_name
+        self._names: dict[str, str] = {}
+        # entity_id -> its tokens, to unindex it again
+        self._entity_tokens: dict[str, frozenset[str]] = {}
+        # token -> entity_ids containing it
+        self._postings: dict[str, set[str]] = {}
+        # Sorted vocabulary for prefix lookups, rebuilt lazily after changes
+        self._vocabulary: list[str] | None = None
+        self._lifecycle_unsub = None
+
+    @callback
+    def async_start(self) -> None:
+        """Index every relevant entity and follow entity lifecycle events."""
+        for state_obj in self._hass.states.async_all():
+            self.async_update_entity(state_obj.entity_id, state_obj)
+        self._lifecycle_unsub = async_get_hub(self._hass).async_track_lifecycle(
+            self.async_update_entity
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following lifecycle events."""
+        if self._lifecycle_unsub is not None:
+            self._lifecycle_unsub()
+            self._lifecycle_unsub = None
+
+    @callback
+    def async_update_entity(self, entity_id: str, state_obj: State | None) -> None:
+        """(Re)index one entity. Pass state_obj=None for a removed entity."""
+        friendly_name = None
+        if state_obj is not None and state_obj.domain in RELEVANT_DOMAINS:
+            friendly_name = state_obj.attributes.get("friendly_name", entity_id)
+        if self._names.get(entity_id) == friendly_name:
+            return
+
+        for token in self._entity_tokens.pop(entity_id, ()):
+            entity_ids = self._postings[token]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._postings[token]
+                self._vocabulary = None
+        self._names.pop(entity_id, None)
+        if friendly_name is None:
+            return
+
+        tokens = frozenset(tokenize(entity_id) + tokenize(friendly_name))
+        self._names[entity_id] = friendly_name
+        self._entity_tokens[entity_id] = tokens
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                self._vocabulary = None
+            self._postings[token].add(entity_id)
+
+    def _token_matches(self, query_token: str) -> dict[str, int]:
+        """Return entity_id -> best match kind for one query token."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        kinds: dict[str, int] = {}
+
+        # Prefix matches (exact included) form one sorted range
+        start = bisect_left(vocabulary, query_token)
+        for position in range(start, len(vocabulary)):
+            token = vocabulary[position]
+            if not token.startswith(query_token):
+                break
+            kind = _EXACT if token == query_token else _PREFIX
+            for entity_id in self._postings[token]:
+                if kinds.get(entity_id, 0) < kind:
+                    kinds[entity_id] = kind
+
+        for token in vocabulary:
+            if query_token in token and not token.startswith(query_token):
+                for entity_id in self._postings[token]:
+                    kinds.setdefault(entity_id, _INFIX)
+        return kinds
+
+    def _token_scores(self, query_tokens: list[str]) -> dict[str, int]:
+        """Return entity_id -> summed match kinds of entities matching every token."""
+        scores: dict[str, int] | None = None
+        for query_token in dict.fromkeys(query_tokens):
+            kinds = self._token_matches(query_token)
+            if scores is None:
+                scores = kinds
+            else:
+                scores = {
+                    entity_id: score + kinds[entity_id]
+                    for entity_id, score in scores.items()
+                    if entity_id in kinds
+                }
+            if not scores:
+                return {}
+        return scores
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        domains: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the top limit entities matching every token of query."""
+        phrase = query.strip().casefold()
+        if not phrase:
+            return []
+        query_tokens = tokenize(phrase)
+        if query_tokens:
+            scores = self._token_scores(query_tokens)
+        else:
+            scores = {
+                entity_id: _INFIX
+                for entity_id, name in self._names.items()
+                if phrase in entity_id or phrase in name.casefold()
+            }
+        if not scores:
+            return []
+
+        if domains is not None:
+            wanted = set(domains)
+            scores = {
+                entity_id: score
+                for entity_id, score in scores.items()
+                if entity_id.partition(".")[0] in wanted
+            }
+
+        # An exact id first, then names or ids that start with or contain the
+        # whole query, then the best token matches, shortest names first.
+        names = self._names
+
+        def _rank(entity_id: str) -> tuple:
+            name = names[entity_id].casefold()
+            leading = (
+                name.startswith(phrase)
+                or entity_id.startswith(phrase)
+                or entity_id.partition(".")[2].startswith(phrase)
+            )
+            contains = leading or phrase in name or phrase in entity_id
+            return (
+                entity_id != phrase,
+                not leading,
+                not contains,
+                -scores[entity_id],
+                len(name),
+                entity_id,
+            )
+
+        states = self._hass.states
+        results = []
+        for entity_id in heapq.nsmallest(limit, scores, key=_rank):
+            state_obj = states.get(entity_id)
+            results.append({
+                "entity_id": entity_id,
+                "friendly_name": names[entity_id],
+                "state": state_obj.state if state_obj is not None else "",
+            })
+        return results
@@ -2,16 +2,31 @@
 # Integration version: 8.10.2
 from __future__ import annotations
 
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.helpers.entity import Entity, EntityCategory
-from homeassistant.helpers.event import async_track_state_change_event, async_call_later
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 import logging
-from .const import COLOR_MAP, DOMAIN, RELEVANT_DOMAINS
+from .const import (
+    COLOR_MAP,
+    DEFAULT_DEBOUNCE_MAX_LATENCY_MS,
+    DEFAULT_DEBOUNCE_QUIET_MS,
+    DOMAIN,
+)
+from .condition_store import get_condition_store
+from .conditions import CompiledCondition, compile_condition
+from .engine import EvaluationEngine
+from .hub import async_get_hub
+from .labels import LabelTemplateCache
+from .membership import SmartGroupIndex
+from .scheduler import CoalescingScheduler
+from .stats import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .profiling import Sampler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,12 +39,17 @@ async def async_setup_entry(
     """Set up the combined notification sensor from a config entry."""
     name = config_entry.data["name"]
     friendly_sensor_name = config_entry.data.get("friendly_sensor_name", name)
-    conditions = config_entry.data.get("conditions", [])
+    conditions = get_condition_store(hass, config_entry.entry_id).conditions
     settings = _build_settings(config_entry.data)
     use_attributes = config_entry.options.get("use_attributes", False)
+    debounce_quiet_ms = config_entry.options.get("debounce_quiet_ms", DEFAULT_DEBOUNCE_QUIET_MS)
+    debounce_max_latency_ms = config_entry.options.get(
+        "debounce_max_latency_ms", DEFAULT_DEBOUNCE_MAX_LATENCY_MS
+    )
 
     sensor = CombinedNotificationSensor(
-        hass, name, friendly_sensor_name, conditions, settings, config_entry.entry_id, use_attributes
+        hass, name, friendly_sensor_name, conditions, settings, config_entry.entry_id, use_attributes,
+        debounce_quiet_ms, debounce_max_latency_ms,
     )
     count_sensor = CombinedNotificationCountSensor(
         hass, name, sensor, config_entry.entry_id
@@ -66,6 +86,22 @@ def _build_settings(data: dict) -> dict:
 class CombinedNotificationSensor(Entity):
     """Representation of a Combined Notification sensor."""
 
+    # Styling only changes on a panel save; keep it out of the recorder so
+    # history holds the alert data alone.
+    _unrecorded_attributes = frozenset({
+        "text_all_clear",
+        "icon_clear",
+        "icon_alert",
+        "color_clear",
+        "color_alert",
+        "text_color_clear",
+        "text_color_alert",
+        "icon_color_clear",
+        "icon_color_alert",
+        "hide_title",
+        "hide_title_alert",
+    })
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -75,6 +111,8 @@ class CombinedNotificationSensor(Entity):
         settings: dict[str, Any],
         entry_id: str,
         use_attributes: bool = False,
+        debounce_quiet_ms: int = DEFAULT_DEBOUNCE_QUIET_MS,
+        debounce_max_latency_ms: int = DEFAULT_DEBOUNCE_MAX_LATENCY_MS,
     ):
         """Initialize the sensor."""
         self._hass = hass
@@ -87,15 +125,34 @@ class CombinedNotificationSensor(Entity):
             if friendly_sensor_name and friendly_sensor_name.strip()
             else name
         )
-        self._raw_conditions = conditions
-        self._conditions = self._validate_conditions(conditions)
+        self._hub = async_get_hub(hass)
+        self._labels = LabelTemplateCache(hass, self._label_templates_changed)
+        self._group_index = SmartGroupIndex(self._hub)
+        self._set_conditions(conditions)
         self._settings = settings
         self._state = settings["text_all_clear"]
         self._unmet = []
-        self._unsubscribe_callbacks = []
-        self._debounced_update_task = None
-        self._startup_unsub = None
-        self._safety_net_unsub = None
+        self._styling_attributes: dict[str, Any] = {}
+        self._build_dynamic_attributes()
+        self._build_styling_attributes()
+        self._subscribed: set[str] = set()
+        self._lifecycle_unsub = None
+        self._engine = EvaluationEngine(hass, self._labels.get)
+        self._pending_entity_ids: set[str] = set()
+        # The profile sampler the callbacks mark their work on, while one runs
+        self._sampler: Sampler | None = None
+        # What was last written, to skip writes that would change nothing
+        self._written: tuple | None = None
+        self.writes_skipped = 0
+        # Time spent in full (async_update) and incremental evaluations
+        self._update_time = LatencyHistogram()
+        self._process_time = LatencyHistogram()
+        self._update_scheduler = CoalescingScheduler(
+            hass,
+            self._async_process_pending,
+            debounce_quiet_ms / 1000,
+            debounce_max_latency_ms / 1000,
+        )
 
         self._attr_has_entity_name = False
         self._attr_should_poll = False
@@ -105,6 +162,16 @@ class CombinedNotificationSensor(Entity):
 
     # ── Condition validation ──────────────────────────────────────────────
 
+    def _set_conditions(self, conditions: list[dict]) -> None:
+        """Validate conditions and compile them once for the hot path."""
+        self._raw_conditions = conditions
+        self._conditions = self._validate_conditions(conditions)
+        self._compiled = [compile_condition(c) for c in self._conditions]
+        self._labels.load(
+            c.label_template for c in self._compiled if c.label_template is not None
+        )
+        self._group_index.load(self._hass, self._conditions)
+
     def _validate_conditions(self, conditions: list[dict]) -> list[dict]:
         """Return only conditions with required keys (skip entity_filter — handled at runtime)."""
         valid = []
@@ -121,62 +188,39 @@ class CombinedNotificationSensor(Entity):
 
     # ── Entity expansion for smart groups ────────────────────────────────
 
-    def _expand_conditions(self) -> list[dict]:
+    def _expand_conditions(self) -> list[list[CompiledCondition]]:
         """
-        Expand entity_filter conditions into individual concrete conditions
-        by scanning hass.states at runtime. Called on every async_update.
-        Individual conditions are returned as-is.
+        Expand every validated condition into its segment of compiled
+        conditions. Called on every full re-evaluation.
         """
-        expanded = []
-        for condition in self._conditions:
-            if "entity_filter" not in condition:
-                expanded.append(condition)
-                continue
+        return [self._expand_segment(position) for position in range(len(self._conditions))]
 
-            keyword = condition["entity_filter"].lower()
-            excluded = set(condition.get("entity_filter_exclude", []))
-            operator = condition.get("operator", "==")
-            trigger_value = condition.get("trigger_value", "")
-            attribute = condition.get("attribute", "")
-            and_conditions = condition.get("and_conditions", [])
-
-            for state_obj in self._hass.states.async_all():
-                entity_id = state_obj.entity_id
-                # Only count domains the panel can also display. This keeps the
-                # invariant that anything the sensor counts is visible/toggleable
-                # in the panel — no counted-but-hidden entities.
-                if entity_id.split(".")[0] not in RELEVANT_DOMAINS:
-                    continue
-                if entity_id in excluded:
-                    continue
-                friendly_name = state_obj.attributes.get("friendly_name", entity_id)
-                if (
-                    keyword in entity_id.lower()
-                    or keyword in friendly_name.lower()
-                ):
-                    label_overrides = condition.get("entity_label_overrides", {})
-                    label = label_overrides.get(entity_id) or friendly_name
-                    expanded.append({
-                        "entity_id": entity_id,
-                        "operator": operator,
-                        "trigger_value": trigger_value,
-                        "attribute": attribute,
-                        "name": label,
-                        "and_conditions": and_conditions,
-                        "_from_filter": True,
-                    })
+    def _expand_segment(self, position: int) -> list[CompiledCondition]:
+        """
+        Expand one condition. An entity_filter condition becomes one
+        compiled condition per current member of the smart group;
+        an individual condition is returned as-is.
+        """
+        compiled = self._compiled[position]
+        condition = self._conditions[position]
+        if "entity_filter" not in condition:
+            return [compiled]
 
+        label_overrides = condition.get("entity_label_overrides", {})
+        expanded = []
+        for entity_id, friendly_name in self._group_index.members(position).items():
+            label = label_overrides.get(entity_id) or friendly_name
+            expanded.append(compiled.for_member(entity_id, label.strip()))
         return expanded
 
     def _get_all_monitored_entity_ids(self) -> set[str]:
         """
         Return the full set of entity IDs that should be monitored.
         For individual conditions: direct entity_id.
-        For smart groups: expand by keyword and exclude list right now,
-        same logic as _expand_conditions but just collecting IDs.
+        For smart groups: the current members from the membership index.
         This is used to build specific listeners — no wildcards.
         """
-        entity_ids = set()
+        entity_ids = self._group_index.all_member_ids()
 
         for c in self._conditions:
             # AND conditions always tracked specifically
@@ -184,27 +228,8 @@ class CombinedNotificationSensor(Entity):
                 if and_cond.get("entity_id"):
                     entity_ids.add(and_cond["entity_id"])
 
-            if "entity_filter" not in c:
-                # Individual condition
-                if c.get("entity_id"):
-                    entity_ids.add(c["entity_id"])
-                continue
-
-            # Smart group — expand right now
-            keyword = c["entity_filter"].lower()
-            if not keyword:
-                continue
-            excluded = set(c.get("entity_filter_exclude", []))
-            for state_obj in self._hass.states.async_all():
-                eid = state_obj.entity_id
-                # Match _expand_conditions: only monitor panel-visible domains.
-                if eid.split(".")[0] not in RELEVANT_DOMAINS:
-                    continue
-                if eid in excluded:
-                    continue
-                friendly_name = state_obj.attributes.get("friendly_name", eid)
-                if keyword in eid.lower() or keyword in friendly_name.lower():
-                    entity_ids.add(eid)
+            if "entity_filter" not in c and c.get("entity_id"):
+                entity_ids.add(c["entity_id"])
 
         return entity_ids
 
@@ -232,27 +257,45 @@ class CombinedNotificationSensor(Entity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        attrs = {
+        return self._attributes
+
+    def _build_styling_attributes(self) -> None:
+        """Rebuild the attributes that only change with the settings."""
+        settings = self._settings
+        self._styling_attributes = {
+            "text_all_clear": settings["text_all_clear"],
+            "icon_clear": settings["icons"]["clear"],
+            "icon_alert": settings["icons"]["alert"],
+            "color_clear": settings["colors"]["clear"],
+            "color_alert": settings["colors"]["alert"],
+            "text_color_clear": settings["text_colors"]["clear"],
+            "text_color_alert": settings["text_colors"]["alert"],
+            "icon_color_clear": settings["icon_colors"]["clear"],
+            "icon_color_alert": settings["icon_colors"]["alert"],
+            "hide_title": settings["hide_title"],
+            "hide_title_alert": settings["hide_title_alert"],
+        }
+        self._merge_attributes()
+
+    def _build_dynamic_attributes(self) -> None:
+        """Rebuild the attributes that follow the evaluation results."""
+        self._dynamic_attributes = {
             "unmet_conditions": self._unmet,
             "number_unmet": len(self._unmet),
             "number_total": len(self._conditions),
-            "text_all_clear": self._settings["text_all_clear"],
-            "icon_clear": self._settings["icons"]["clear"],
-            "icon_alert": self._settings["icons"]["alert"],
-            "color_clear": self._settings["colors"]["clear"],
-            "color_alert": self._settings["colors"]["alert"],
-            "text_color_clear": self._settings["text_colors"]["clear"],
-            "text_color_alert": self._settings["text_colors"]["alert"],
-            "icon_color_clear": self._settings["icon_colors"]["clear"],
-            "icon_color_alert": self._settings["icon_colors"]["alert"],
             "is_clear": not bool(self._unmet),
-            "hide_title": self._settings["hide_title"],
-            "hide_title_alert": self._settings["hide_title_alert"],
         }
         # In attribute mode, also expose the full alert list as a Python list
         if self._use_attributes:
-            attrs["alert_list"] = list(self._unmet)
-        return attrs
+            self._dynamic_attributes["alert_list"] = list(self._unmet)
+        self._merge_attributes()
+
+    def _merge_attributes(self) -> None:
+        """
+        Combine both parts into a new dict. It is returned as-is on every
+        read, and replaced (never mutated) so written states can be compared.
+        """
+        self._attributes = {**self._dynamic_attributes, **self._styling_attributes}
 
     @property
     def device_info(self):
@@ -267,17 +310,48 @@ class CombinedNotificationSensor(Entity):
 
     @callback
     def _state_change_listener(self, event):
-        """Handle entity state changes with debouncing."""
-        if self._debounced_update_task:
-            self._debounced_update_task.cancel()
-
-        async def debounced_update():
-            self.async_schedule_update_ha_state(True)
-            self._debounced_update_task = None
+        """Handle entity state changes — a burst is coalesced into one evaluation."""
+        entity_id = event.data["entity_id"]
+        sampler = self._sampler
+        if sampler is not None:
+            self._mark("state change", self._engine.segments_reading((entity_id,)))
+        self._pending_entity_ids.add(entity_id)
+        self._update_scheduler.async_trigger()
+        if sampler is not None:
+            sampler.current = None
+
+    async def _async_process_pending(self) -> None:
+        """Re-check only the conditions that read the changed entities."""
+        entity_ids = self._pending_entity_ids
+        self._pending_entity_ids = set()
+        if not entity_ids:
+            return
+        sampler = self._sampler
+        if sampler is not None:
+            self._mark("state change", self._engine.segments_reading(entity_ids))
+        started = time.perf_counter()
+        try:
+            if self._engine.evaluate_entities(entity_ids):
+                self._apply_results()
+                self._async_write_state()
+        finally:
+            if sampler is not None:
+                sampler.current = None
+        self._process_time.record(time.perf_counter() - started)
 
-        self._debounced_update_task = self._hass.async_create_task(
-            debounced_update()
-        )
+    @callback
+    def _label_templates_changed(self, template_strs: set[str]) -> None:
+        """Refresh the alerts whose dynamic label re-rendered."""
+        sampler = self._sampler
+        if sampler is not None:
+            self._mark("template", self._engine.segments_rendering(template_strs))
+        try:
+            if self._engine.evaluate_templates(template_strs):
+                self._apply_results()
+                self._async_write_state()
+        finally:
+            if sampler is not None:
+                sampler.current = None
 
     # ── Lifecycle ─────────────────────────────────────────────────────────
 
@@ -285,126 +359,102 @@ class CombinedNotificationSensor(Entity):
         """Set up listeners when added to HA."""
         await self._subscribe_listeners()
 
-        async def _resubscribe(_now=None) -> None:
-            """Resubscribe and re-evaluate — catches late-loading integrations."""
-            await self._subscribe_listeners()
-            await self.async_update()
-            self.async_write_ha_state()
+        # Smart group membership follows entities as they are created,
+        # removed and renamed — late-loading integrations are picked up
+        # the moment their entities appear, with no resubscribe.
+        self._lifecycle_unsub = self._hub.async_track_lifecycle(self._update_membership)
 
-        # Fire once when HA is fully started — catches most slow integrations
-        self._startup_unsub = self._hass.bus.async_listen_once(
-            EVENT_HOMEASSISTANT_STARTED, _resubscribe
-        )
-
-        # Safety net for very slow cloud integrations (Mercedes, etc.)
-        self._safety_net_unsub = async_call_later(self._hass, 60, _resubscribe)
+        # HA writes the initial state right after this returns
+        self._written = self._state_signature()
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up listeners."""
         self._unsubscribe_all()
-        if self._debounced_update_task:
-            self._debounced_update_task.cancel()
-        if self._startup_unsub:
-            self._startup_unsub()
-        if self._safety_net_unsub:
-            self._safety_net_unsub()
+        self._update_scheduler.async_cancel()
+        self._group_index.async_release()
+        if self._lifecycle_unsub:
+            self._lifecycle_unsub()
+            self._lifecycle_unsub = None
 
     async def _subscribe_listeners(self) -> None:
         """
         Subscribe state change listeners for all tracked entities.
-        Smart groups are expanded to specific entity IDs right now —
+        Smart groups are subscribed by their current members —
         no wildcards. Reliable, efficient, same method as individual conditions.
-        A save from the panel re-runs this, picking up any new devices.
+        Subscriptions go through the shared hub, so an entity tracked by
+        several sensors is still listened to once. Entities that are
+        already subscribed keep their subscription.
         """
-        self._unsubscribe_all()
+        wanted = self._get_all_monitored_entity_ids()
+        for entity_id in self._subscribed - wanted:
+            self._unsubscribe_entity(entity_id)
+        for entity_id in wanted:
+            self._subscribe_entity(entity_id)
 
-        entity_ids = self._get_all_monitored_entity_ids()
+        self._labels.async_track()
 
-        if entity_ids:
-            unsub = async_track_state_change_event(
-                self._hass, list(entity_ids), self._state_change_listener
-            )
-            self._unsubscribe_callbacks.append(unsub)
+    def _subscribe_entity(self, entity_id: str) -> None:
+        if entity_id not in self._subscribed:
+            self._subscribed.add(entity_id)
+            self._hub.async_subscribe(entity_id, self._state_change_listener)
 
-    def _unsubscribe_all(self) -> None:
-        for unsub in self._unsubscribe_callbacks:
-            unsub()
-        self._unsubscribe_callbacks.clear()
+    def _unsubscribe_entity(self, entity_id: str) -> None:
+        if entity_id in self._subscribed:
+            self._subscribed.discard(entity_id)
+            self._hub.async_unsubscribe(entity_id, self._state_change_listener)
 
-    # ── Update ────────────────────────────────────────────────────────────
-
-    async def async_update(self) -> None:
-        """Evaluate all conditions and update sensor state."""
-        self._unmet = []
-
-        expanded = self._expand_conditions()
-
-        for condition in expanded:
-            entity_id = condition.get("entity_id")
-            if not entity_id:
-                continue
+    def _unsubscribe_all(self) -> None:
+        for entity_id in list(self._subscribed):
+            self._unsubscribe_entity(entity_id)
+        self._labels.async_untrack()
 
-            state_obj = self._hass.states.get(entity_id)
-            if state_obj is None or state_obj.state in ("unknown", "unavailable"):
-                continue
+    # ── Smart group membership ────────────────────────────────────────────
 
-            attribute = condition.get("attribute", "")
-            if attribute:
-                actual = str(state_obj.attributes.get(attribute, ""))
+    @callback
+    def _update_membership(self, entity_id: str, state_obj: State | None) -> None:
+        """Add or drop one entity in the affected smart groups only."""
+        sampler = self._sampler
+        try:
+            positions = self._group_index.async_update_entity(entity_id, state_obj)
+            if not positions:
+                return
+            if sampler is not None:
+                self._mark("membership", tuple(positions))
+
+            changed = False
+            for position in positions:
+                if self._engine.replace_segment(position, self._expand_segment(position)):
+                    changed = True
+
+            if self._engine.reads(entity_id):
+                self._subscribe_entity(entity_id)
             else:
-                actual = state_obj.state
-
-            operator = condition.get("operator", "==")
-            trigger_value = condition.get("trigger_value", "")
+                self._unsubscribe_entity(entity_id)
 
-            # Resolve label — supports Jinja2 templates
-            use_template = condition.get("use_label_template", False)
-            if use_template and condition.get("label_template", "").strip():
-                label = await self._render_label_template(
-                    condition["label_template"],
-                    condition.get("label_fallback", "").strip() or condition.get("name", "").strip() or entity_id
-                )
-            else:
-                label = condition.get("name", "").strip()
-                if not label:
-                    state_obj2 = self._hass.states.get(entity_id)
-                    label = state_obj2.attributes.get("friendly_name", entity_id) if state_obj2 else entity_id
+            if changed:
+                self._apply_results()
+                self._async_write_state()
+        finally:
+            if sampler is not None:
+                sampler.current = None
 
-            if not self._evaluate(actual, trigger_value, operator):
-                continue
+    # ── Update ────────────────────────────────────────────────────────────
 
-            and_conditions = condition.get("and_conditions", [])
-            if and_conditions:
-                and_passed = True
-                for and_cond in and_conditions:
-                    and_entity_id = and_cond.get("entity_id")
-                    if not and_entity_id:
-                        continue
-                    and_state_obj = self._hass.states.get(and_entity_id)
-                    if and_state_obj is None or and_state_obj.state in (
-                        "unknown", "unavailable"
-                    ):
-                        and_passed = False
-                        break
-                    and_attr = and_cond.get("attribute", "")
-                    if and_attr:
-                        and_actual = str(
-                            and_state_obj.attributes.get(and_attr, "")
-                        )
-                    else:
-                        and_actual = and_state_obj.state
-                    if not self._evaluate(
-                        and_actual,
-                        and_cond.get("trigger_value", ""),
-                        and_cond.get("operator", "=="),
-                    ):
-                        and_passed = False
-                        break
-                if not and_passed:
-                    continue
-
-            if label and label.strip():
-                self._unmet.append(label)
+    async def async_update(self) -> None:
+        """Re-expand and evaluate all conditions and update sensor state."""
+        started = time.perf_counter()
+        self._pending_entity_ids.clear()
+        self._engine.load(self._expand_conditions())
+        self._engine.evaluate_all()
+        self._apply_results()
+        self._update_time.record(time.perf_counter() - started)
+
+    def _apply_results(self) -> None:
+        """Build state, icon and count from the engine's unmet list."""
+        unmet = self._engine.unmet
+        if unmet != self._unmet or len(self._conditions) != self._dynamic_attributes["number_total"]:
+            self._unmet = unmet
+            self._build_dynamic_attributes()
 
         # Build state based on mode
         if self._use_attributes:
@@ -429,86 +479,126 @@ class CombinedNotificationSensor(Entity):
             else self._settings["icons"]["alert"]
         )
         if hasattr(self, "_count_sensor"):
-            self._count_sensor.async_schedule_update_ha_state()
+            self._count_sensor.async_update_if_changed()
 
-    async def _render_label_template(self, template_str: str, fallback: str) -> str:
-        """Render a Jinja2 label template, returning fallback on any error."""
-        try:
-            from homeassistant.helpers.template import Template
-            tmpl = Template(template_str, self._hass)
-            result = tmpl.async_render()
-            return str(result).strip() if result is not None else fallback
-        except Exception as err:
-            _LOGGER.debug("Label template render failed: %s — using fallback: %s", err, fallback)
-            return fallback
-
-    # ── Condition evaluator ───────────────────────────────────────────────
-
-    def _evaluate(self, actual: str, expected: str, operator: str) -> bool:
-        """Evaluate a single condition."""
-        for sym in (">=", "<=", "!=", ">", "<", "==", "="):
-            if isinstance(expected, str) and expected.startswith(sym):
-                operator = sym
-                expected = expected[len(sym):].strip()
-                break
-        label_map = {
-            "equals": "==",
-            "not equal to": "!=",
-            "greater than": ">",
-            "less than": "<",
-        }
-        operator = label_map.get(operator, operator)
-        try:
-            if operator in ("==", "="):
-                return str(actual) == str(expected)
-            if operator == "!=":
-                return str(actual) != str(expected)
-            a, e = float(actual), float(expected)
-            if operator == ">":  return a > e
-            if operator == "<":  return a < e
-            if operator == ">=": return a >= e
-            if operator == "<=": return a <= e
-        except (ValueError, TypeError) as err:
+    def _state_signature(self) -> tuple:
+        """Return everything a state write publishes."""
+        return (self._state, self._attr_icon, self._attr_name, self.extra_state_attributes)
+
+    @callback
+    def _async_write_state(self) -> None:
+        """
+        Write the state unless state, icon, name and attributes are all
+        identical to the last write — each write is a state_changed event
+        and a recorder row.
+        """
+        written = self._state_signature()
+        if written == self._written:
+            self.writes_skipped += 1
             _LOGGER.debug(
-                "Condition evaluation failed (%s %s %s): %s",
-                actual, operator, expected, err,
+                "Skipped unchanged state write for %s (%d skipped)",
+                self._name, self.writes_skipped,
             )
-        return False
+            return
+        self._written = written
+        self.async_write_ha_state()
+
+    # ── Statistics ────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        """Return the runtime counters of this sensor and its count sensor."""
+        count_sensor = getattr(self, "_count_sensor", None)
+        return {
+            "entity_id": self.entity_id,
+            "conditions": len(self._conditions),
+            "evaluations": self._engine.checks,
+            "full_updates": self._update_time.as_dict(),
+            "incremental_updates": self._process_time.as_dict(),
+            "smart_groups": self._group_index.sizes(),
+            "listeners": {
+                "entities": len(self._subscribed),
+                "templates": self._labels.tracked_count,
+            },
+            "template_renders": self._labels.renders,
+            "writes_skipped": self.writes_skipped,
+            "count_writes_skipped": count_sensor.writes_skipped if count_sensor else 0,
+        }
+
+    def start_sampling(self, sampler: Sampler) -> None:
+        """Mark the work of every condition on sampler until stop_sampling()."""
+        self._sampler = sampler
+        self._engine.start_sampling(sampler, self.entity_id)
+
+    def stop_sampling(self) -> None:
+        """Stop marking work for the sampler."""
+        self._sampler = None
+        self._engine.stop_sampling()
+
+    def _mark(self, path: str, segments: tuple[int, ...]) -> None:
+        """Tell the sampler the loop now works on path for these segments."""
+        self._sampler.current = (self.entity_id, path, segments)
+
+    def condition_names(self) -> list[str]:
+        """Return a readable name per validated condition, in engine segment order."""
+        return [
+            c.get("name") or c.get("entity_id") or f"Smart group: {c.get('entity_filter')}"
+            for c in self._conditions
+        ]
 
     # ── Dynamic updates from panel ────────────────────────────────────────
 
     async def async_update_conditions(self, new_conditions: list[dict]) -> None:
-        """Update conditions and re-subscribe listeners."""
-        self._raw_conditions = new_conditions
-        self._conditions = self._validate_conditions(new_conditions)
+        """
+        Apply new conditions by difference: unchanged smart groups keep
+        their members, only added or dropped entities are subscribed or
+        unsubscribed, and only new or changed conditions are evaluated.
+        """
+        self._set_conditions(new_conditions)
         await self._subscribe_listeners()
-        await self.async_update()
+        # reload() keeps the results of unchanged conditions, so changes
+        # still waiting for the scheduler are applied on top of them now.
+        pending = self._pending_entity_ids
+        self._pending_entity_ids = set()
+        self._engine.reload(self._expand_conditions())
+        if pending:
+            self._engine.evaluate_entities(pending)
+        self._apply_results()
 
     async def async_update_settings(
         self, new_settings: dict[str, Any], new_conditions: list[dict]
     ) -> None:
-        """Update settings and conditions from the panel save."""
+        """
+        Update settings and conditions from the panel save. A save that
+        leaves the conditions untouched (styling, texts, icons) only
+        rebuilds the state and attributes.
+        """
         try:
             self._settings = new_settings
+            self._build_styling_attributes()
             if "friendly_sensor_name" in new_settings and new_settings["friendly_sensor_name"]:
                 self._attr_name = new_settings["friendly_sensor_name"]
                 self._friendly_sensor_name = new_settings["friendly_sensor_name"]
-            if self._use_attributes:
-                self._state = "off"
+            if new_conditions != self._raw_conditions:
+                await self.async_update_conditions(new_conditions)
             else:
-                self._state = new_settings["text_all_clear"][:255]
-            self._attr_icon = new_settings["icons"]["clear"]
-            await self.async_update_conditions(new_conditions)
-            self.async_write_ha_state()
+                self._apply_results()
+            self._async_write_state()
         except Exception as err:
             _LOGGER.error("Error updating settings: %s", err)
             raise
 
+    async def async_apply_conditions(self, new_conditions: list[dict]) -> None:
+        """Apply conditions patched one at a time through the condition store."""
+        if new_conditions != self._raw_conditions:
+            await self.async_update_conditions(new_conditions)
+            self._async_write_state()
+
     async def async_update_use_attributes(self, use_attributes: bool) -> None:
         """Update attribute mode flag and re-evaluate state."""
         self._use_attributes = use_attributes
+        self._build_dynamic_attributes()
         await self.async_update()
-        self.async_write_ha_state()
+        self._async_write_state()
 
 
 # ── Count sensor ──────────────────────────────────────────────────────────────
@@ -531,6 +621,8 @@ class CombinedNotificationCountSensor(Entity):
         self._attr_should_poll = False
         self._attr_icon = "mdi:counter"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._written: int | None = None
+        self.writes_skipped = 0
 
     @property
     def state(self) -> int:
@@ -540,5 +632,16 @@ class CombinedNotificationCountSensor(Entity):
     def device_info(self):
         return self._parent.device_info
 
+    @callback
+    def async_update_if_changed(self) -> None:
+        """Schedule a state write only when the count differs from the last one."""
+        count = self.state
+        if count == self._written:
+            self.writes_skipped += 1
+            return
+        self._written = count
+        self.async_schedule_update_ha_state()
+
     async def async_added_to_hass(self) -> None:
+        self._written = self.state
         self._parent._count_sensor = self
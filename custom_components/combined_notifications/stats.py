@@ -0,0 +1,46 @@
+"""Runtime counters and latency histograms for Combined Notifications."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds of the latency buckets in milliseconds; a last bucket holds
+# everything slower.
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations, cheap enough for the hot path."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize empty buckets."""
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one duration, in seconds."""
+        ms = seconds * 1000
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as JSON-serializable data, in milliseconds."""
+        buckets = {
+            f"<={bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.counts)
+        }
+        buckets[f">{LATENCY_BUCKETS_MS[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
@@ -0,0 +1,114 @@
+"""Content versioning for the Combined Notifications REST views."""
+# Integration version: 8.10.2
+from __future__ import annotations
+
+from collections.abc import Callable
+import secrets
+import zlib
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .const import DOMAIN, RELEVANT_DOMAINS
+
+VERSIONS_KEY = "_versions"
+
+# Serialized bodies kept per view variant
+MAX_CACHED_BODIES = 32
+
+
+@callback
+def async_get_versions(hass: HomeAssistant) -> ContentVersions:
+    """Return the domain-wide content versions, creating them on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    versions = domain_data.get(VERSIONS_KEY)
+    if versions is None:
+        versions = domain_data[VERSIONS_KEY] = ContentVersions(hass)
+        versions.async_start()
+    return versions
+
+
+@callback
+def async_stop_versions(hass: HomeAssistant) -> None:
+    """Stop and drop the content versions; the next request starts new ones."""
+    versions = hass.data.get(DOMAIN, {}).pop(VERSIONS_KEY, None)
+    if versions is not None:
+        versions.async_stop()
+
+
+class ContentVersions:
+    """
+    Revision counters for the payloads the panel polls.
+
+    Each config entry has a revision that is bumped whenever its config is
+    saved or reloaded, and the states snapshot has a generation that is
+    bumped by every state change in RELEVANT_DOMAINS. Together with a
+    random id per instance they form the ETags of the REST views, and the serialized body of the
+    current version is kept so repeated requests are not rebuilt.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the counters."""
+        self._hass = hass
+        # Counters restart at 0 with every instance (a restart, or the last
+        # entry unloading); the id keeps an ETag of an earlier instance from
+        # matching new content.
+        self._instance_id = secrets.token_hex(4)
+        self._revisions: dict[str, int] = {}
+        self.states_generation = 0
+        self._bodies: dict[str, tuple[str, bytes]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start counting state changes."""
+        self._unsub = self._hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            self._async_state_changed,
+            event_filter=self._async_is_relevant,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop counting state changes."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @staticmethod
+    @callback
+    def _async_is_relevant(event_data) -> bool:
+        return event_data["entity_id"].partition(".")[0] in RELEVANT_DOMAINS
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        self.states_generation += 1
+
+    @callback
+    def async_bump_config(self, entry_id: str) -> None:
+        """Record that the config of entry_id changed."""
+        self._revisions[entry_id] = self._revisions.get(entry_id, 0) + 1
+
+    def config_revision(self, entry_id: str) -> int:
+        """Return the current config revision of entry_id."""
+        return self._revisions.get(entry_id, 0)
+
+    def config_etag(self, entry_id: str) -> str:
+        """Return the ETag of the config payload of entry_id."""
+        return f'"cfg-{self._instance_id}-{entry_id}-{self.config_revision(entry_id)}"'
+
+    def states_etag(self, variant: str) -> str:
+        """Return the ETag of a states payload; variant identifies its options."""
+        digest = zlib.crc32(variant.encode())
+        return f'"st-{self._instance_id}-{self.states_generation}-{digest:08x}"'
+
+    def body(self, variant: str, etag: str, build: Callable[[], bytes]) -> bytes:
+        """Return the serialized body for etag, building it only once."""
+        cached = self._bodies.get(variant)
+        if cached is not None and cached[0] == etag:
+            return cached[1]
+        if len(self._bodies) >= MAX_CACHED_BODIES:
+            self._bodies.clear()
+        body = build()
+        self._bodies[variant] = (etag, body)
+        return body
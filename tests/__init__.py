@@ -0,0 +1 @@
+"""Tests for the Combined Notifications integration."""
@@ -0,0 +1,103 @@
+"""Stand-in HomeAssistant shared by the tests and the benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Callable
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import State
+
+
+class FakeStates:
+    """The parts of homeassistant.core.StateMachine the integration reads."""
+
+    def __init__(self) -> None:
+        self._states: dict[str, State] = {}
+
+    def get(self, entity_id: str) -> State | None:
+        return self._states.get(entity_id)
+
+    def async_all(self, domain_filter=None) -> list[State]:
+        return list(self._states.values())
+
+    def async_set(self, entity_id: str, state: str, attributes: dict | None = None) -> State:
+        new_state = State(entity_id, state, attributes or {})
+        self._states[entity_id] = new_state
+        return new_state
+
+    def async_remove(self, entity_id: str) -> State | None:
+        return self._states.pop(entity_id, None)
+
+
+class FakeEvent:
+    """The attributes of homeassistant.core.Event the integration reads."""
+
+    __slots__ = ("event_type", "data")
+
+    def __init__(self, event_type: str, data: dict) -> None:
+        self.event_type = event_type
+        self.data = data
+
+
+class FakeBus:
+    """Minimal event bus: listeners per event type, fired synchronously."""
+
+    def __init__(self) -> None:
+        self._listeners: dict[str, list[tuple[Callable, Any]]] = defaultdict(list)
+
+    def async_listen(self, event_type: str, listener: Callable, event_filter=None, **kwargs):
+        entry = (listener, event_filter)
+        self._listeners[event_type].append(entry)
+        return lambda: self._listeners[event_type].remove(entry)
+
+    def async_listen_once(self, event_type: str, listener: Callable):
+        return self.async_listen(event_type, listener)
+
+    def async_fire(self, event_type: str, data: dict) -> None:
+        event = FakeEvent(event_type, data)
+        for listener, event_filter in list(self._listeners[event_type]):
+            if event_filter is None or event_filter(event.data):
+                listener(event)
+
+
+class FakeHass:
+    """Stand-in for HomeAssistant: state machine, event bus and hass.data."""
+
+    def __init__(self) -> None:
+        self.states = FakeStates()
+        self.bus = FakeBus()
+        self.data: dict[str, Any] = {}
+        self.loop = asyncio.get_running_loop()
+
+    def async_create_task(self, coro, *args, **kwargs):
+        return self.loop.create_task(coro)
+
+    async def async_block_till_done(self) -> None:
+        """Run the loop until every other task is done."""
+        current = asyncio.current_task()
+        # A timer due now runs after this task in the same loop pass, so the
+        # loop only counts as idle after two passes without another task.
+        idle_passes = 0
+        while idle_passes < 2:
+            await asyncio.sleep(0)
+            busy = any(task is not current and not task.done() for task in asyncio.all_tasks())
+            idle_passes = 0 if busy else idle_passes + 1
+
+    def async_set_state(
+        self, entity_id: str, state: str, attributes: dict | None = None
+    ) -> None:
+        """Set a state and fire state_changed, as the state machine does."""
+        old_state = self.states.get(entity_id)
+        new_state = self.states.async_set(entity_id, state, attributes)
+        self._fire_state_changed(entity_id, old_state, new_state)
+
+    def async_remove_state(self, entity_id: str) -> None:
+        """Remove an entity and fire state_changed with no new state."""
+        old_state = self.states.async_remove(entity_id)
+        self._fire_state_changed(entity_id, old_state, None)
+
+    def _fire_state_changed(self, entity_id, old_state, new_state) -> None:
+        self.bus.async_fire(EVENT_STATE_CHANGED, {
+            "entity_id": entity_id, "old_state": old_state, "new_state": new_state,
+        })
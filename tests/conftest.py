@@ -0,0 +1,5 @@
+"""Make custom_components importable when pytest runs from the repo root."""
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
@@ -0,0 +1,89 @@
+"""Tests for the Combined Notifications sensor."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.combined_notifications import sensor as cn_sensor  # noqa: E402
+
+from .common import FakeHass  # noqa: E402
+
+
+def _door(entity_id: str, name: str) -> dict:
+    return {
+        "entity_id": entity_id, "operator": "==", "trigger_value": "on",
+        "name": name, "paused": False,
+    }
+
+
+def test_pending_change_survives_condition_save():
+    """A change waiting for the scheduler is applied by a conditions save."""
+
+    async def run():
+        hass = FakeHass()
+        hass.async_set_state("binary_sensor.front_door", "off")
+        hass.async_set_state("binary_sensor.back_door", "off")
+        conditions = [_door("binary_sensor.front_door", "Front door")]
+        sensor = cn_sensor.CombinedNotificationSensor(
+            hass, "test", "Test", conditions, cn_sensor._build_settings({}), "entry",
+            debounce_quiet_ms=60_000, debounce_max_latency_ms=60_000,
+        )
+        sensor.async_write_ha_state = lambda: None
+        await sensor.async_added_to_hass()
+        await sensor.async_update()
+        assert sensor.extra_state_attributes["number_unmet"] == 0
+
+        # Queued for the scheduler, which will not fire within the test
+        hass.async_set_state("binary_sensor.front_door", "on")
+        await sensor.async_update_conditions(
+            [*conditions, _door("binary_sensor.back_door", "Back door")]
+        )
+        assert sensor.extra_state_attributes["unmet_conditions"] == ["Front door"]
+
+        await sensor.async_will_remove_from_hass()
+
+    asyncio.run(run())
+
+
+def test_group_gate_survives_save_and_membership_change():
+    """A failing group AND chain still skips every member after edits."""
+
+    async def run():
+        hass = FakeHass()
+        hass.async_set_state("alarm_control_panel.home", "armed_away")
+        for n in range(3):
+            hass.async_set_state(f"binary_sensor.window_{n}", "on")
+        group = {
+            "entity_filter": "window", "operator": "==", "trigger_value": "on",
+            "entity_filter_exclude": [], "paused": False,
+            "and_conditions": [{
+                "entity_id": "alarm_control_panel.home", "operator": "==",
+                "trigger_value": "armed_away",
+            }],
+        }
+        sensor = cn_sensor.CombinedNotificationSensor(
+            hass, "test", "Test", [group], cn_sensor._build_settings({}), "entry",
+            debounce_quiet_ms=0, debounce_max_latency_ms=0,
+        )
+        sensor.async_write_ha_state = lambda: None
+        await sensor.async_added_to_hass()
+        await sensor.async_update()
+
+        # A save recompiles the group; a new window joins it afterwards
+        await sensor.async_update_conditions([dict(group)])
+        hass.async_set_state("binary_sensor.window_3", "on")
+        await hass.async_block_till_done()
+        assert sensor.extra_state_attributes["number_unmet"] == 4
+
+        checks = sensor._engine.checks
+        hass.async_set_state("alarm_control_panel.home", "disarmed")
+        await hass.async_block_till_done()
+        assert sensor.extra_state_attributes["number_unmet"] == 0
+        assert sensor._engine.checks == checks
+
+        await sensor.async_will_remove_from_hass()
+
+    asyncio.run(run())